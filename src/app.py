@@ -2,8 +2,10 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from src.config import Config
-from src.database import Database
+from src.database import get_db
+from src.migrations import apply_schema
 from src.scraper import HellDivers2Scraper
 from src.collector import DataCollector
 
@@ -17,7 +19,7 @@ logger = logging.getLogger(__name__)
 database_url = Config.DATABASE_URL
 if not database_url:
     raise ValueError("DATABASE_URL environment variable must be set")
-db = Database(database_url)
+db = get_db(database_url)
 scraper = HellDivers2Scraper()
 collector = DataCollector(db, interval=300)
 
@@ -27,6 +29,7 @@ collector = DataCollector(db, interval=300)
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting Hell Divers 2 API")
+    apply_schema(database_url)
     if not collector.is_running:
         collector.start()
     yield
@@ -34,6 +37,7 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down Hell Divers 2 API")
     collector.stop()
     scraper.close()
+    db.close_pool()
 
 
 # Initialize FastAPI app
@@ -42,6 +46,7 @@ app = FastAPI(
     description="Real-time scraper for Hell Divers 2 game data",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
@@ -87,13 +92,14 @@ async def get_campaigns():
     """Get campaign information (with cache fallback)"""
     # Try live API first
     data = scraper.get_campaign_info()
-
-    # Fallback to cache if live API fails
-    if data is None:
-        data = db.get_latest_campaigns_snapshot()
-
     if data is not None:
         return data
+
+    # Fallback to cache if live API fails: the snapshot is already JSON
+    # encoded by the database, so pass it through as the body
+    raw = db.get_latest_campaigns_snapshot_raw()
+    if raw is not None:
+        return Response(content=raw, media_type="application/json")
     raise HTTPException(
         status_code=503, detail="No campaign data available (live fetch failed and no cached data)"
     )
@@ -2,10 +2,11 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from src.config import Config
-from src.database import Database
+from src.database import get_db
 from src.scraper import HellDivers2Scraper
-from src.claude_proxy import router as claude_router
+from src.claude_proxy import router as claude_router, close_client as close_claude_client
 
 # Configure logging
 logging.basicConfig(
@@ -17,9 +18,14 @@ logger = logging.getLogger(__name__)
 database_url = Config.DATABASE_URL
 if not database_url:
     raise ValueError("DATABASE_URL environment variable must be set")
-db = Database(database_url)
+db = get_db(database_url)
 scraper = HellDivers2Scraper()
 
+# Public UI config depends only on env read at import; build it once
+PUBLIC_CONFIG = {
+    "claudeEnabled": bool(Config.CLAUDE_API_KEY),
+}
+
 
 # Lifespan context manager for startup/shutdown
 @asynccontextmanager
@@ -31,6 +37,7 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down Hell Divers 2 API")
     scraper.close()
     db.close_pool()
+    await close_claude_client()
 
 
 # Initialize FastAPI app
@@ -39,6 +46,7 @@ app = FastAPI(
     description="Read-only API for Hell Divers 2 game data",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Claude proxy (when CLAUDE_API_KEY is set)
@@ -86,13 +94,14 @@ async def get_campaigns():
     """Get campaign information (with cache fallback)"""
     # Try live API first
     data = scraper.get_campaign_info()
-
-    # Fallback to cache if live API fails
-    if data is None:
-        data = db.get_latest_campaigns_snapshot()
-
     if data is not None:
         return data
+
+    # Fallback to cache if live API fails: the snapshot is already JSON
+    # encoded by the database, so pass it through as the body
+    raw = db.get_latest_campaigns_snapshot_raw()
+    if raw is not None:
+        return Response(content=raw, media_type="application/json")
     raise HTTPException(
         status_code=503, detail="No campaign data available (live fetch failed and no cached data)"
     )
@@ -390,9 +399,7 @@ async def get_biomes():
 @app.get("/api/config", tags=["Config"])
 async def get_config():
     """Public config for UI (e.g. whether Claude is available via backend)."""
-    return {
-        "claudeEnabled": bool(Config.CLAUDE_API_KEY),
-    }
+    return PUBLIC_CONFIG
 
 
 @app.get("/api/livez", tags=["Health"])
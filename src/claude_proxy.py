@@ -3,8 +3,10 @@ Claude API proxy - forwards /claude/* to Anthropic API with API key from config.
 The key is read from CLAUDE_API_KEY env (typically from a k8s secret).
 """
 import logging
-from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import Response
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 import httpx
 from src.config import Config
 
@@ -13,46 +15,166 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/claude", tags=["Claude"])
 ANTHROPIC_BASE = "https://api.anthropic.com"
 
+# Hop-by-hop headers (plus host) are never forwarded in either direction.
+# content-encoding is deliberately absent: bodies are relayed raw.
+# Kept as bytes so the raw ASGI/httpx header lists are filtered without decoding.
+_HOP_BY_HOP = frozenset({
+    b"connection",
+    b"keep-alive",
+    b"proxy-authenticate",
+    b"proxy-authorization",
+    b"te",
+    b"trailers",
+    b"transfer-encoding",
+    b"upgrade",
+    b"host",
+})
+# Hop-by-hop names grouped by their first two bytes. Upstream names may be
+# mixed case; most (x-*, anthropic-*, date, ...) miss on the 2-byte prefix and
+# never pay for a full lower() of the name.
+_HOP_FIRST2 = {
+    head: frozenset(name for name in _HOP_BY_HOP if name[:2] == head)
+    for head in {name[:2] for name in _HOP_BY_HOP}
+}
 
-@router.api_route("/{path:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
-async def proxy_to_anthropic(request: Request, path: str):
-    """Proxy requests to Anthropic API, adding API key from server config."""
-    api_key = Config.CLAUDE_API_KEY
-    if not api_key:
-        raise HTTPException(
-            status_code=503,
-            detail="Claude API key not configured. Set CLAUDE_API_KEY in environment.",
+# CLAUDE_API_KEY is fixed for the process lifetime; resolve it (and the
+# headers added to every upstream request) once at import
+_API_KEY = Config.CLAUDE_API_KEY
+_STATIC_REQUEST_HEADERS = [
+    (b"x-api-key", _API_KEY.encode("latin-1")),
+    (b"anthropic-dangerous-direct-browser-access", b"true"),
+]
+# Client copies of the static headers are dropped so the server key takes precedence
+_REQUEST_DROP = _HOP_BY_HOP | {name for name, _ in _STATIC_REQUEST_HEADERS}
+_BODY_HEADERS = frozenset({b"content-length", b"transfer-encoding"})
+_NO_PROXY_BUFFERING = (b"x-accel-buffering", b"no")
+_SSE_CONTENT_TYPE = "text/event-stream"
+_MISSING_KEY_BODY = {
+    "detail": "Claude API key not configured. Set CLAUDE_API_KEY in environment."
+}
+
+
+def _is_hop_by_hop(name: bytes) -> bool:
+    """Check an upstream header name (any case) against the hop-by-hop set"""
+    names = _HOP_FIRST2.get(name[:2].lower())
+    return names is not None and name.lower() in names
+
+
+# Shared upstream client so TCP+TLS connections to Anthropic are reused across requests
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Get or create the shared upstream client (lazy init)"""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=ANTHROPIC_BASE,
+            # Multiplex concurrent requests over a few HTTP/2 connections
+            http2=True,
+            timeout=60.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=200,
+                keepalive_expiry=60,
+            ),
         )
+    return _client
+
 
-    # Map /claude/messages -> /v1/messages
-    anthropic_path = f"/v1/{path}" if path else "/v1"
-    url = f"{ANTHROPIC_BASE}{anthropic_path}"
+async def close_client():
+    """Close the shared upstream client. Call on application shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
-    # Forward headers, ensure API key is set (server key takes precedence)
-    headers = dict(request.headers)
-    headers.pop("host", None)
-    headers["x-api-key"] = api_key
-    headers["anthropic-dangerous-direct-browser-access"] = "true"
 
+async def _relay(upstream: httpx.Response) -> AsyncIterator[bytes]:
+    """Yield raw upstream body chunks, releasing the connection however the stream ends.
+
+    The response's BackgroundTask covers normal completion and client
+    disconnects, but is skipped when the upstream fails mid-stream.
+    """
     try:
-        body = await request.body()
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.request(
+        async for chunk in upstream.aiter_raw():
+            yield chunk
+    finally:
+        await upstream.aclose()
+
+
+async def _proxy_impl(request: Request, path: str):
+    """Proxy a request to Anthropic API, adding API key from server config."""
+    if not _API_KEY:
+        # Return error bodies directly rather than unwinding through HTTPException
+        return ORJSONResponse(_MISSING_KEY_BODY, status_code=503)
+
+    # Forward headers, ensure API key is set (server key takes precedence).
+    # One pass over the ASGI header list (names are already lowercase bytes)
+    # also notes whether a body follows, so GET etc. carry none.
+    headers = []
+    has_body = False
+    for k, v in request.scope["headers"]:
+        if k in _BODY_HEADERS:
+            has_body = True
+        if k not in _REQUEST_DROP:
+            headers.append((k, v))
+    headers.extend(_STATIC_REQUEST_HEADERS)
+
+    # Stream the request body through instead of buffering it
+    content = request.stream() if has_body else None
+
+    client = _get_client()
+    try:
+        upstream = await client.send(
+            client.build_request(
                 method=request.method,
-                url=url,
-                headers=headers,
-                content=body,
-            )
-        # Forward only safe headers (exclude transfer-encoding, connection, etc.)
-        forward_headers = {
-            k: v for k, v in response.headers.items()
-            if k.lower() not in ("transfer-encoding", "connection", "content-encoding")
-        }
-        return Response(
-            content=response.content,
-            status_code=response.status_code,
-            headers=forward_headers,
+                # /claude/<path> maps to /v1/<path>. Always a relative URL, so
+                # the host stays ANTHROPIC_BASE: httpx would send an absolute
+                # path (/claude/https://...) to that host with our API key
+                url=f"/v1/{path}",
+                headers=httpx.Headers(headers),
+                content=content,
+            ),
+            stream=True,
         )
-    except httpx.HTTPError as e:
-        logger.error(f"Claude proxy error: {e}")
-        raise HTTPException(status_code=502, detail=f"Upstream error: {str(e)}")
+    except httpx.TransportError as e:
+        # Connect/read/write/pool timeouts and protocol errors talking to Anthropic
+        logger.error("Claude proxy error: %s", e)
+        return ORJSONResponse({"detail": f"Upstream error: {str(e)}"}, status_code=502)
+
+    # Body is relayed as raw upstream bytes, so content-encoding/length stay valid
+    response = StreamingResponse(
+        _relay(upstream),
+        status_code=upstream.status_code,
+        background=BackgroundTask(upstream.aclose),
+    )
+    response.raw_headers.extend(
+        (k, v) for k, v in upstream.headers.raw if not _is_hop_by_hop(k)
+    )
+    # stream=true replies are SSE: aiter_raw already yields each chunk as it
+    # arrives (no chunk_size, which would re-buffer small events); also ask any
+    # nginx in front not to buffer the stream
+    if upstream.headers.get("content-type", "").startswith(_SSE_CONTENT_TYPE):
+        response.raw_headers.append(_NO_PROXY_BUFFERING)
+    return response
+
+
+# POST /claude/messages is nearly all traffic; a literal route registered
+# ahead of the catch-all matches it without the {path:path} converter
+@router.post("/messages")
+async def proxy_messages(request: Request):
+    """Proxy the Messages API."""
+    return await _proxy_impl(request, "messages")
+
+
+# One route per method instead of a multi-method api_route; decorators
+# register bottom-up, so POST is matched first
+@router.delete("/{path:path}")
+@router.patch("/{path:path}")
+@router.put("/{path:path}")
+@router.get("/{path:path}")
+@router.post("/{path:path}")
+async def proxy_to_anthropic(request: Request, path: str):
+    """Proxy requests to Anthropic API, adding API key from server config."""
+    return await _proxy_impl(request, path)
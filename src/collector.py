@@ -40,95 +40,101 @@ class DataCollector:
 
     def collect_all_data(self):
         """Collect all available data"""
-        logger.info("Starting data collection cycle")
+        # Every save in the cycle reuses one pooled connection
+        with self.db.pinned_connection():
+            logger.info("Starting data collection cycle")
+
+            try:
+                # Collect war status
+                war_data = self.scraper.get_war_status()
+                if war_data is not None:
+                    self.db.save_war_status(war_data)
+                    logger.info("War status collected")
+                else:
+                    logger.warning("Failed to collect war status")
 
-        try:
-            # Collect war status
-            war_data = self.scraper.get_war_status()
-            if war_data is not None:
-                self.db.save_war_status(war_data)
-                logger.info("War status collected")
-            else:
-                logger.warning("Failed to collect war status")
-
-            # Collect statistics
-            stats_data = self.scraper.get_statistics()
-            if stats_data is not None:
-                self.db.save_statistics(stats_data)
-                logger.info("Statistics collected")
-            else:
-                logger.warning("Failed to collect statistics")
-
-            # Collect planets
-            planets = self.scraper.get_planets()
-            if planets is not None:
-                if planets:
-                    for planet in planets:
-                        planet_index = planet.get("index")
-                        if planet_index:
-                            self.db.save_planet_status(planet_index, planet)
-                    logger.info(f"Collected data for {len(planets)} planets")
+                # Collect statistics
+                stats_data = self.scraper.get_statistics()
+                if stats_data is not None:
+                    self.db.save_statistics(stats_data)
+                    logger.info("Statistics collected")
+                else:
+                    logger.warning("Failed to collect statistics")
+
+                # Collect planets and campaigns, then save both in one transaction
+                planets = self.scraper.get_planets()
+                campaigns = self.scraper.get_campaign_info()
+                if planets or campaigns:
+                    try:
+                        # Re-fetched every cycle, so skip waiting on the WAL flush
+                        with self.db.transaction(synchronous_commit=False) as cursor:
+                            if planets:
+                                self.db.save_planet_statuses_tx(cursor, planets)
+                            if campaigns:
+                                self.db.save_campaigns_tx(cursor, campaigns)
+                    except Exception as e:
+                        logger.error(f"Failed to save planets and campaigns: {e}")
+
+                if planets is not None:
+                    if planets:
+                        logger.info(f"Collected data for {len(planets)} planets")
+                    else:
+                        logger.info("Collected 0 planets (empty response)")
                 else:
-                    logger.info("Collected 0 planets (empty response)")
-            else:
-                logger.warning("Failed to collect planets")
-
-            # Collect campaigns
-            campaigns = self.scraper.get_campaign_info()
-            if campaigns is not None:
-                if campaigns:
-                    for campaign in campaigns:
-                        campaign_id = campaign.get("id")
-                        planet_index = campaign.get("planet", {}).get("index")
-                        if campaign_id and planet_index:
-                            self.db.save_campaign(campaign_id, planet_index, campaign)
-                    logger.info(f"Collected {len(campaigns)} campaigns")
+                    logger.warning("Failed to collect planets")
+
+                if campaigns is not None:
+                    if campaigns:
+                        logger.info(f"Collected {len(campaigns)} campaigns")
+                    else:
+                        logger.info("Collected 0 campaigns (empty response)")
                 else:
-                    logger.info("Collected 0 campaigns (empty response)")
-            else:
-                logger.warning("Failed to collect campaigns")
-
-            # Collect assignments (Major Orders)
-            assignments = self.scraper.get_assignments()
-            if assignments is not None:
-                if assignments:
-                    self.db.save_assignments(assignments)
-                    logger.info(f"Collected {len(assignments)} assignments")
+                    logger.warning("Failed to collect campaigns")
+
+                # Collect assignments (Major Orders)
+                assignments = self.scraper.get_assignments()
+                if assignments is not None:
+                    if assignments:
+                        self.db.save_assignments(assignments)
+                        logger.info(f"Collected {len(assignments)} assignments")
+                    else:
+                        logger.info("Collected 0 assignments (empty response)")
                 else:
-                    logger.info("Collected 0 assignments (empty response)")
-            else:
-                logger.warning("Failed to collect assignments")
-
-            # Collect dispatches (news)
-            dispatches = self.scraper.get_dispatches()
-            if dispatches is not None:
-                if dispatches:
-                    self.db.save_dispatches(dispatches)
-                    logger.info(f"Collected {len(dispatches)} dispatches")
+                    logger.warning("Failed to collect assignments")
+
+                # Collect dispatches (news)
+                dispatches = self.scraper.get_dispatches()
+                if dispatches is not None:
+                    if dispatches:
+                        self.db.save_dispatches(dispatches)
+                        logger.info(f"Collected {len(dispatches)} dispatches")
+                    else:
+                        logger.info("Collected 0 dispatches (empty response)")
                 else:
-                    logger.info("Collected 0 dispatches (empty response)")
-            else:
-                logger.warning("Failed to collect dispatches")
-
-            # Collect planet events
-            events = self.scraper.get_planet_events()
-            if events is not None:
-                if events:
-                    self.db.save_planet_events(events)
-                    logger.info(f"Collected {len(events)} planet events")
+                    logger.warning("Failed to collect dispatches")
+
+                # Collect planet events
+                events = self.scraper.get_planet_events()
+                if events is not None:
+                    if events:
+                        self.db.save_planet_events(events)
+                        logger.info(f"Collected {len(events)} planet events")
+                    else:
+                        logger.info("Collected 0 planet events (empty response)")
                 else:
-                    logger.info("Collected 0 planet events (empty response)")
-            else:
-                logger.warning("Failed to collect planet events")
+                    logger.warning("Failed to collect planet events")
 
-            logger.info("Data collection cycle completed successfully")
-            # Mark upstream as available after successful collection
-            self.db.set_upstream_status(True)
+                logger.info("Data collection cycle completed successfully")
+                # Mark upstream as available after successful collection
+                self.db.set_upstream_status(True)
 
-        except Exception as e:
-            logger.error(f"Error during data collection: {e}")
-            # Mark upstream as unavailable on any collection error
-            self.db.set_upstream_status(False)
+            except Exception as e:
+                logger.error(f"Error during data collection: {e}")
+                # Mark upstream as unavailable on any collection error
+                self.db.set_upstream_status(False)
+
+            # Cached fallback snapshots are stale once the cycle has written
+            self.db.invalidate_snapshots()
 
     def collect_planet_data(self, planet_index: int):
         """Collect data for a specific planet"""
@@ -136,6 +142,7 @@ class DataCollector:
             planet_data = self.scraper.get_planet_status(planet_index)
             if planet_data:
                 self.db.save_planet_status(planet_index, planet_data)
+                self.db.invalidate_snapshots()
                 logger.info(f"Planet {planet_index} data collected")
                 return planet_data
         except Exception as e:
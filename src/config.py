@@ -1,7 +1,13 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+# .env files are a local-development convenience; production images get their
+# env from k8s and do not ship python-dotenv
+try:
+    from dotenv import load_dotenv
+except ImportError:
+    pass
+else:
+    load_dotenv()
 
 
 class Config:
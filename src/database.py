@@ -1,33 +1,255 @@
+import functools
+import io
 import json
 import logging
+import os
+import threading
+import time
+import weakref
 import psycopg2
+import psycopg2.extras
 from psycopg2 import pool
+from psycopg2.extras import Json
+from contextlib import contextmanager
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from src.config import Config
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is a declared dependency
+    orjson = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
-# Connection pool defaults (poller does 264+ planet saves + 44 campaign saves per cycle)
-DEFAULT_POOL_MIN_CONN = 2
-DEFAULT_POOL_MAX_CONN = 50
+# Connection pool defaults (saves are batched, so a modest pool covers the
+# poller plus concurrent API reads)
+DEFAULT_POOL_MIN_CONN = 5
+DEFAULT_POOL_MAX_CONN = 25
+# Pooled connections older than this are closed instead of returned
+# (POOL_RECYCLE_SEC env overrides)
+DEFAULT_POOL_RECYCLE_SEC = 1800
+# TCP keepalives detect connections silently dropped by NAT/idle timeouts
+POOL_CONNECT_KWARGS = {
+    # Give up on an unreachable server instead of hanging the caller
+    "connect_timeout": 5,
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 3,
+    "application_name": "hd2-api",
+}
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment, falling back on bad values"""
+    value = os.getenv(name)
+    if value is not None:
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    return default
+
+# JSON codec: orjson when available (several times faster), stdlib otherwise
+_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize obj to a JSON string"""
+    if orjson is None:
+        return json.dumps(obj)
+    # Integer dict keys are valid to stdlib json; keep accepting them
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class _Json(Json):
+    """psycopg2 Json adapter that serializes with _dumps"""
+
+    def dumps(self, obj):
+        return _dumps(obj)
+
+
+# JSON/JSONB values come back as Python objects decoded by _loads (psycopg2's
+# default typecasters use stdlib json)
+psycopg2.extras.register_default_jsonb(loads=_loads, globally=True)
+psycopg2.extras.register_default_json(loads=_loads, globally=True)
+
+# Rows per multi-row INSERT for bulk saves (execute_values page size)
+BATCH_PAGE_SIZE = 500
+
+# History reads larger than this stream through a server-side cursor,
+# fetching HISTORY_ITERSIZE rows per round trip
+HISTORY_STREAM_THRESHOLD = 50
+HISTORY_ITERSIZE = 100
+
+# Snapshots only change once per collection cycle; serve repeats from memory
+SNAPSHOT_CACHE_TTL = Config.SCRAPE_INTERVAL / 2
+# Snapshot reads back the fallback path; a stuck query should fail fast
+# (SNAPSHOT_STATEMENT_TIMEOUT_MS env overrides). Applied per transaction with
+# SET LOCAL, so it is safe behind a transaction-mode pooler and leaves the
+# write paths' budget alone.
+DEFAULT_SNAPSHOT_STATEMENT_TIMEOUT_MS = 2000
+# Seconds a read of the upstream-availability flag is reused (health probes)
+UPSTREAM_STATUS_TTL = 5
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_iso_utc(value: str) -> Optional[datetime]:
+    """Parse an ISO 8601 string as an aware datetime (naive means UTC), or None.
+
+    Cached: every cycle re-saves the same handful of campaign expiry strings.
+    """
+    try:
+        # Parse ISO 8601 format, normalize 'Z' to UTC offset
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        # Ensure result is timezone-aware (UTC)
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt
+    except ValueError:
+        return None
+
+
+def _biome_name(planet: Dict) -> Optional[str]:
+    """Name of a planet's biome object, or None when it has no named biome"""
+    biome = planet.get("biome")
+    if isinstance(biome, dict) and biome.get("name"):
+        return biome["name"]
+    return None
+
+
+def _env_flag(name: str) -> bool:
+    """Read a boolean setting from the environment (1/true/yes/on)"""
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _positional(sql: str) -> str:
+    """Rewrite psycopg2 %s placeholders as $1, $2, ... for PREPARE"""
+    parts = sql.split("%s")
+    return "".join(
+        part + (f"${i}" if i < len(parts) else "") for i, part in enumerate(parts, 1)
+    )
+
+
+# Single-row writes and fixed snapshot reads, by name. Run as server-side
+# prepared statements when DB_PREPARED_STATEMENTS is enabled (see
+# Database._execute_statement).
+_STATEMENTS = {
+    "save_planet_status": """INSERT INTO planet_status (planet_index, data, biome_id)
+       VALUES (%s, %s, (SELECT id FROM biomes WHERE name = %s))
+       ON CONFLICT (planet_index)
+       DO UPDATE SET data = EXCLUDED.data,
+                     biome_id = EXCLUDED.biome_id,
+                     timestamp = CURRENT_TIMESTAMP""",
+    "save_biome": """INSERT INTO biomes (name, data)
+       VALUES (%s, %s)
+       ON CONFLICT (name)
+       DO UPDATE SET data = EXCLUDED.data, timestamp = CURRENT_TIMESTAMP
+       WHERE biomes.data IS DISTINCT FROM EXCLUDED.data""",
+    "save_campaign": """INSERT INTO campaigns (campaign_id, planet_index, status, data)
+       VALUES (%s, %s, %s, %s)
+       ON CONFLICT (campaign_id)
+       DO UPDATE SET planet_index = EXCLUDED.planet_index,
+                     status = EXCLUDED.status,
+                     data = EXCLUDED.data,
+                     timestamp = CURRENT_TIMESTAMP""",
+    "save_assignment": """INSERT INTO assignments (assignment_id, data)
+       VALUES (%s, %s)
+       ON CONFLICT (assignment_id)
+       DO UPDATE SET data = EXCLUDED.data, timestamp = CURRENT_TIMESTAMP""",
+    "save_dispatch": """INSERT INTO dispatches (dispatch_id, data)
+       VALUES (%s, %s)
+       ON CONFLICT (dispatch_id)
+       DO UPDATE SET data = EXCLUDED.data, timestamp = CURRENT_TIMESTAMP""",
+    "save_planet_event": """INSERT INTO planet_events (event_id, planet_index, event_type, data)
+       VALUES (%s, %s, %s, %s)
+       ON CONFLICT (event_id)
+       DO UPDATE SET planet_index = EXCLUDED.planet_index,
+                     event_type = EXCLUDED.event_type,
+                     data = EXCLUDED.data,
+                     timestamp = CURRENT_TIMESTAMP""",
+    "update_system_status": """INSERT INTO system_status (key, value)
+       VALUES (%s, %s)
+       ON CONFLICT (key)
+       DO UPDATE SET value = EXCLUDED.value, timestamp = CURRENT_TIMESTAMP""",
+    "snapshot_planets": """SELECT DISTINCT ON (planet_index) data FROM planet_status
+       ORDER BY planet_index ASC, timestamp DESC""",
+    # Campaigns (as JSON text), factions and biomes in one row
+    "snapshot_all": """WITH latest_campaigns AS (
+           SELECT DISTINCT ON (campaign_id) data, timestamp
+           FROM campaigns
+           ORDER BY campaign_id, timestamp DESC
+       )
+       SELECT
+           (SELECT json_agg(data ORDER BY timestamp DESC)::text FROM latest_campaigns),
+           (SELECT data->'factions' FROM war_status ORDER BY timestamp DESC LIMIT 1),
+           (SELECT json_agg(data ORDER BY name) FROM biomes)""",
+}
+
+
+def _cached_snapshot(method: Callable) -> Callable:
+    """Serve a snapshot method from Database._snapshot_cache
+
+    Results are reused for SNAPSHOT_CACHE_TTL seconds or until
+    invalidate_snapshots(). None (no data or a failed query) is not cached.
+    """
+    key = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        now = time.monotonic()
+        entry = self._snapshot_cache.get(key)
+        if entry is not None and now - entry[0] < SNAPSHOT_CACHE_TTL:
+            return entry[1]
+        result = method(self)
+        if result is not None:
+            self._snapshot_cache[key] = (now, result)
+        return result
+
+    return wrapper
 
 
 class _PooledConnection:
-    """Wrapper that returns connection to pool on close() instead of closing it."""
+    """Wrapper that returns connection to pool on close() instead of closing it.
+
+    Only the connection methods the Database uses are exposed, bound once per
+    checkout; reach the raw psycopg2 connection through ``raw`` for anything else.
+    """
 
-    def __init__(self, conn, pool_instance):
-        self._conn = conn
+    __slots__ = ("raw", "_pool", "_recycle_at", "cursor", "commit", "rollback")
+
+    def __init__(self, conn, pool_instance, recycle_at: float):
+        self.raw = conn
         self._pool = pool_instance
+        self._recycle_at = recycle_at
+        self.cursor = conn.cursor
+        self.commit = conn.commit
+        self.rollback = conn.rollback
 
     def close(self):
         try:
-            self._conn.rollback()
+            self.rollback()
         except Exception:
             pass
-        self._pool.putconn(self._conn)
+        # Past its recycle deadline the connection is closed; the pool opens a
+        # fresh one on demand
+        self._pool.putconn(self.raw, close=time.monotonic() > self._recycle_at)
+
+
+class _PinnedConnection(_PooledConnection):
+    """A thread's pinned connection: close() only rolls back unfinished work
 
-    def __getattr__(self, name: str) -> Any:
-        return getattr(self._conn, name)
+    The connection stays checked out until Database.pinned_connection() exits.
+    """
+
+    __slots__ = ()
+
+    def close(self):
+        try:
+            self.rollback()
+        except Exception:
+            pass
 
 
 class Database:
@@ -42,38 +264,142 @@ class Database:
                          If None, will try to get from DATABASE_URL env var
         """
         if database_url is None:
-            import os
             database_url = os.getenv("DATABASE_URL", "")
 
         if not database_url:
             raise ValueError("DATABASE_URL must be provided")
 
         self.database_url = database_url
-        self._initialized = False
+        self._init_lock = threading.Lock()
         self._pool: Optional[pool.ThreadedConnectionPool] = None
+        self._pool_recycle_sec = _env_int("POOL_RECYCLE_SEC", DEFAULT_POOL_RECYCLE_SEC)
+        # Session-level PREPARE breaks behind a transaction-mode pooler
+        # (PgBouncer), so prepared statements are opt-in
+        self._use_prepared = _env_flag("DB_PREPARED_STATEMENTS")
+        # Statement names already prepared, per raw connection
+        self._prepared: "weakref.WeakKeyDictionary[Any, set]" = weakref.WeakKeyDictionary()
+        # First checkout time per raw connection, for recycling
+        self._conn_born: "weakref.WeakKeyDictionary[Any, float]" = weakref.WeakKeyDictionary()
+        # Snapshot method name -> (cached at, result); see _cached_snapshot
+        self._snapshot_cache: Dict[str, Tuple[float, Any]] = {}
+        self._snapshot_timeout_ms = _env_int(
+            "SNAPSHOT_STATEMENT_TIMEOUT_MS", DEFAULT_SNAPSHOT_STATEMENT_TIMEOUT_MS
+        )
+        # Last value this process wrote per system_status key
+        self._system_status_written: Dict[str, str] = {}
+        # (read at, available) from the last upstream status read or write
+        self._upstream_cache: Optional[Tuple[float, bool]] = None
+        # Per-thread pin state for pinned_connection()
+        self._local = threading.local()
 
     def _get_pool(self) -> pool.ThreadedConnectionPool:
-        """Get or create the connection pool (lazy init)"""
+        """Get or create the connection pool (lazy init)
+
+        The schema is not created here; entry points run
+        src.migrations.apply_schema once at startup.
+        """
         if self._pool is None:
-            import os
-            maxconn = DEFAULT_POOL_MAX_CONN
-            if (env_max := os.getenv("POOL_MAX_CONN")) is not None:
-                try:
-                    maxconn = int(env_max)
-                except ValueError:
-                    pass
-            self._pool = pool.ThreadedConnectionPool(
-                minconn=DEFAULT_POOL_MIN_CONN,
-                maxconn=maxconn,
-                dsn=self.database_url,
-            )
-            logger.info("Database connection pool initialized")
+            with self._init_lock:
+                if self._pool is None:
+                    maxconn = _env_int("POOL_MAX_CONN", DEFAULT_POOL_MAX_CONN)
+                    self._pool = pool.ThreadedConnectionPool(
+                        minconn=min(DEFAULT_POOL_MIN_CONN, maxconn),
+                        maxconn=maxconn,
+                        dsn=self.database_url,
+                        **POOL_CONNECT_KWARGS,
+                    )
+                    logger.info("Database connection pool initialized")
         return self._pool
 
     def _get_connection(self):
-        """Get a database connection from the pool (returns to pool on close)."""
-        conn = self._get_pool().getconn()
-        return _PooledConnection(conn, self._get_pool())
+        """Get a database connection from the pool (returns to pool on close).
+
+        Inside pinned_connection() the thread's pinned connection is returned
+        instead, checked out on first use.
+        """
+        if getattr(self._local, "pinning", False):
+            if self._local.conn is None:
+                self._local.conn = self._checkout(_PinnedConnection)
+            return self._local.conn
+        return self._checkout(_PooledConnection)
+
+    def _checkout(self, wrapper: type) -> Any:
+        """Check a connection out of the pool, wrapped in the given class"""
+        pool_instance = self._get_pool()
+        conn = pool_instance.getconn()
+        born = self._conn_born.setdefault(conn, time.monotonic())
+        return wrapper(conn, pool_instance, born + self._pool_recycle_sec)
+
+    def _execute_statement(self, conn, cursor, name: str, params: tuple) -> None:
+        """Execute a named statement from _STATEMENTS
+
+        With DB_PREPARED_STATEMENTS on, each connection PREPAREs the statement
+        the first time it runs it and EXECUTEs it after that, skipping
+        parse/plan on the server.
+        """
+        if not self._use_prepared:
+            cursor.execute(_STATEMENTS[name], params or None)
+            return
+        prepared = self._prepared.setdefault(conn.raw, set())
+        if name not in prepared:
+            cursor.execute(f"PREPARE {name} AS {_positional(_STATEMENTS[name])}")
+            prepared.add(name)
+        if params:
+            cursor.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+        else:
+            cursor.execute(f"EXECUTE {name}")
+
+    def _limit_snapshot_read(self, cursor) -> None:
+        """Bound the current transaction's statements to the snapshot timeout"""
+        cursor.execute("SET LOCAL statement_timeout = %s", (self._snapshot_timeout_ms,))
+
+    @contextmanager
+    def transaction(self, synchronous_commit: bool = True) -> Iterator[Any]:
+        """Run several writes on one pooled connection with a single commit
+
+        Yields a cursor; commits when the block exits cleanly, otherwise the
+        connection is rolled back as it goes back to the pool. With
+        synchronous_commit=False the commit does not wait for the WAL flush
+        (a crash may lose the transaction, never corrupt it).
+        """
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cursor:
+                if not synchronous_commit:
+                    cursor.execute("SET LOCAL synchronous_commit = off")
+                yield cursor
+            conn.commit()
+        finally:
+            conn.close()
+
+    @contextmanager
+    def pinned_connection(self) -> Iterator[None]:
+        """Reuse one pooled connection for every database call in the block
+
+        Meant for the collector: a cycle's saves run on the current thread
+        back to back, so checking out and returning a connection per save
+        only contends on the pool lock. The connection is taken on first use
+        and returned when the block exits; calls from other threads are
+        unaffected. Nested blocks share the outer pin.
+        """
+        if getattr(self._local, "pinning", False):
+            yield
+            return
+        self._local.pinning = True
+        self._local.conn = None
+        try:
+            yield
+        finally:
+            conn = self._local.conn
+            self._local.pinning = False
+            self._local.conn = None
+            if conn is not None:
+                # Full release: rollback, then back to the pool (or recycled)
+                _PooledConnection.close(conn)
+
+    def invalidate_snapshots(self) -> None:
+        """Drop cached snapshots (call after writing new data)"""
+        self._snapshot_cache.clear()
 
     def close_pool(self):
         """Close the connection pool. Call on application shutdown."""
@@ -92,167 +418,34 @@ class Database:
         Returns:
             Timezone-aware datetime in UTC, or None if parsing fails
         """
-        try:
-            # Parse ISO 8601 format, normalize 'Z' to UTC offset
-            dt = datetime.fromisoformat(expiration_time.replace('Z', '+00:00'))
-            # Ensure result is timezone-aware (UTC)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-        except (ValueError, AttributeError):
+        # Non-strings (None, numbers) can't be parsed and may not be hashable
+        if not isinstance(expiration_time, str):
             return None
-
-    def _init_db(self):
-        """Initialize database schema (lazy - called on first use)"""
-        conn = None
-        try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-
-            # War Status Table
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS war_status (
-                    id SERIAL PRIMARY KEY,
-                    data JSONB NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
-
-            # Statistics Table
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS statistics (
-                    id SERIAL PRIMARY KEY,
-                    data JSONB NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
-
-            # Planet Status Table
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS planet_status (
-                    id SERIAL PRIMARY KEY,
-                    planet_index INTEGER UNIQUE NOT NULL,
-                    data JSONB NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
-
-            # Campaigns Table
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS campaigns (
-                    id SERIAL PRIMARY KEY,
-                    campaign_id BIGINT UNIQUE NOT NULL,
-                    planet_index INTEGER,
-                    status TEXT,
-                    data JSONB NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
-
-            # Assignments Table (Major Orders)
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS assignments (
-                    id SERIAL PRIMARY KEY,
-                    assignment_id BIGINT UNIQUE NOT NULL,
-                    data JSONB NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
-
-            # Dispatches Table
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS dispatches (
-                    id SERIAL PRIMARY KEY,
-                    dispatch_id BIGINT UNIQUE NOT NULL,
-                    data JSONB NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
-
-            # Planet Events Table
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS planet_events (
-                    id SERIAL PRIMARY KEY,
-                    event_id BIGINT UNIQUE NOT NULL,
-                    planet_index INTEGER,
-                    event_type TEXT,
-                    data JSONB NOT NULL,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
-
-            # System Status Table
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS system_status (
-                    id SERIAL PRIMARY KEY,
-                    key TEXT UNIQUE NOT NULL,
-                    value TEXT,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-                """
-            )
-
-            # Create indexes for frequently queried columns
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_war_status_timestamp ON war_status(timestamp)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_statistics_timestamp ON statistics(timestamp)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_planet_status_index ON planet_status(planet_index)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_campaigns_timestamp ON campaigns(timestamp)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_assignments_timestamp ON assignments(timestamp)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_dispatches_timestamp ON dispatches(timestamp)"
-            )
-            cursor.execute(
-                "CREATE INDEX IF NOT EXISTS idx_planet_events_index ON planet_events(planet_index)"
-            )
-
-            conn.commit()
-            conn.close()
-        except psycopg2.OperationalError:
-            # Database connection failed - this is OK during tests/imports
-            # Schema will be created when first actual operation happens
-            pass
-        except Exception:
-            # Any other error during init is also OK - will be handled on first use
-            pass
+        return _parse_iso_utc(expiration_time)
+
+    @classmethod
+    def _campaign_status(cls, data: Dict, now: datetime) -> str:
+        """Classify a campaign as active/expired from its expiresAt field"""
+        expiration_time = data.get("expiresAt")
+        if expiration_time:
+            exp_dt = cls._parse_expiration_time(expiration_time)
+            if exp_dt:
+                return "active" if now < exp_dt else "expired"
+        # Default to active if missing or parsing fails
+        return "active"
 
     def save_war_status(self, data: Dict) -> bool:
         """Save war status to database"""
         try:
-            self._init_db()  # Ensure schema exists (idempotent)
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "INSERT INTO war_status (data) VALUES (%s)",
-                    (json.dumps(data),)
-                )
-                conn.commit()
-                return True
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "INSERT INTO war_status (data) VALUES (%s)",
+                        (_Json(data),)
+                    )
+                    conn.commit()
+                    return True
             finally:
                 conn.close()
         except Exception as e:
@@ -264,13 +457,13 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "INSERT INTO statistics (data) VALUES (%s)",
-                    (json.dumps(data),)
-                )
-                conn.commit()
-                return True
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "INSERT INTO statistics (data) VALUES (%s)",
+                        (_Json(data),)
+                    )
+                    conn.commit()
+                    return True
             finally:
                 conn.close()
         except Exception as e:
@@ -282,16 +475,20 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """INSERT INTO planet_status (planet_index, data) 
-                       VALUES (%s, %s)
-                       ON CONFLICT (planet_index) 
-                       DO UPDATE SET data = EXCLUDED.data, timestamp = CURRENT_TIMESTAMP""",
-                    (planet_index, json.dumps(data)),
-                )
-                conn.commit()
-                return True
+                with conn.cursor() as cursor:
+                    biome_name = _biome_name(data)
+                    if biome_name is not None:
+                        self._execute_statement(
+                            conn, cursor, "save_biome", (biome_name, _Json(data["biome"]))
+                        )
+                    self._execute_statement(
+                        conn,
+                        cursor,
+                        "save_planet_status",
+                        (planet_index, _Json(data), biome_name),
+                    )
+                    conn.commit()
+                    return True
             finally:
                 conn.close()
         except Exception as e:
@@ -303,53 +500,134 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                # Check if campaign has expired
-                expiration_time = data.get("expiresAt")
-                status = "unknown"
-                if expiration_time:
-                    exp_dt = self._parse_expiration_time(expiration_time)
-                    if exp_dt:
-                        now = datetime.now(timezone.utc)
-                        status = "active" if now < exp_dt else "expired"
-                    else:
-                        status = "active"  # Default to active if parsing fails
-                else:
-                    status = "active"
-
-                cursor.execute(
-                    """INSERT INTO campaigns (campaign_id, planet_index, status, data) 
-                       VALUES (%s, %s, %s, %s)
-                       ON CONFLICT (campaign_id) 
-                       DO UPDATE SET planet_index = EXCLUDED.planet_index, 
-                                     status = EXCLUDED.status, 
-                                     data = EXCLUDED.data, 
-                                     timestamp = CURRENT_TIMESTAMP""",
-                    (campaign_id, planet_index, status, json.dumps(data)),
-                )
-                conn.commit()
-                return True
+                with conn.cursor() as cursor:
+                    status = self._campaign_status(data, datetime.now(timezone.utc))
+                    self._execute_statement(
+                        conn,
+                        cursor,
+                        "save_campaign",
+                        (campaign_id, planet_index, status, _Json(data)),
+                    )
+                    conn.commit()
+                    return True
             finally:
                 conn.close()
         except Exception as e:
             logger.error(f"Failed to save campaign: {e}")
             return False
 
+    def save_planet_statuses(self, planets: List[Dict]) -> bool:
+        """Save or update many planet statuses (see save_planet_statuses_tx)"""
+        try:
+            with self.transaction() as cursor:
+                self.save_planet_statuses_tx(cursor, planets)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save planet statuses: {e}")
+            return False
+
+    def save_planet_statuses_tx(self, cursor, planets: List[Dict]) -> None:
+        """Upsert many planet statuses on an open transaction's cursor
+
+        The whole planet list is streamed with one COPY into a temp table
+        (dropped at commit), then merged with a single upsert. Their biomes
+        are upserted into the biomes table first so each planet row can
+        carry its biome_id.
+        """
+        # Keyed by index: one statement may not upsert the same row twice.
+        # COPY text format: tab-separated, backslash is the escape char
+        # (JSON escapes control characters, so no raw tabs/newlines appear).
+        rows = {}
+        for planet in planets:
+            planet_index = planet.get("index")
+            if planet_index is not None:
+                rows[planet_index] = "%d\t%s\n" % (
+                    planet_index,
+                    _dumps(planet).replace("\\", "\\\\"),
+                )
+        if not rows:
+            return
+        cursor.execute(
+            """CREATE TEMP TABLE _planet_status_stage (
+                   planet_index INTEGER,
+                   data JSONB
+               ) ON COMMIT DROP"""
+        )
+        cursor.copy_expert(
+            "COPY _planet_status_stage (planet_index, data) FROM STDIN",
+            io.StringIO("".join(rows.values())),
+        )
+        cursor.execute(
+            """INSERT INTO biomes (name, data)
+               SELECT DISTINCT ON (data->'biome'->>'name') data->'biome'->>'name', data->'biome'
+               FROM _planet_status_stage
+               WHERE jsonb_typeof(data->'biome') = 'object'
+                 AND data->'biome'->>'name' <> ''
+               ORDER BY data->'biome'->>'name', planet_index
+               ON CONFLICT (name)
+               DO UPDATE SET data = EXCLUDED.data, timestamp = CURRENT_TIMESTAMP
+               WHERE biomes.data IS DISTINCT FROM EXCLUDED.data"""
+        )
+        cursor.execute(
+            """INSERT INTO planet_status (planet_index, data, biome_id)
+               SELECT stage.planet_index, stage.data, biomes.id
+               FROM _planet_status_stage stage
+               LEFT JOIN biomes ON biomes.name = stage.data->'biome'->>'name'
+               ON CONFLICT (planet_index)
+               DO UPDATE SET data = EXCLUDED.data,
+                             biome_id = EXCLUDED.biome_id,
+                             timestamp = CURRENT_TIMESTAMP"""
+        )
+
+    def save_campaigns(self, campaigns: List[Dict]) -> bool:
+        """Save many campaigns (see save_campaigns_tx)"""
+        try:
+            with self.transaction() as cursor:
+                self.save_campaigns_tx(cursor, campaigns)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save campaigns: {e}")
+            return False
+
+    def save_campaigns_tx(self, cursor, campaigns: List[Dict]) -> None:
+        """Upsert many campaigns on an open transaction's cursor in one multi-row statement"""
+        now = datetime.now(timezone.utc)
+        rows = {}
+        for campaign in campaigns:
+            campaign_id = campaign.get("id")
+            planet_index = campaign.get("planet", {}).get("index")
+            if campaign_id is not None and planet_index is not None:
+                rows[campaign_id] = (
+                    campaign_id,
+                    planet_index,
+                    self._campaign_status(campaign, now),
+                    _Json(campaign),
+                )
+        if not rows:
+            return
+        psycopg2.extras.execute_values(
+            cursor,
+            """INSERT INTO campaigns (campaign_id, planet_index, status, data)
+               VALUES %s
+               ON CONFLICT (campaign_id)
+               DO UPDATE SET planet_index = EXCLUDED.planet_index,
+                             status = EXCLUDED.status,
+                             data = EXCLUDED.data,
+                             timestamp = CURRENT_TIMESTAMP""",
+            list(rows.values()),
+            template="(%s, %s, %s, %s)",
+            page_size=BATCH_PAGE_SIZE,
+        )
+
     def get_latest_war_status(self) -> Optional[Dict]:
         """Get the latest war status"""
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                cursor.execute("SELECT data FROM war_status ORDER BY timestamp DESC LIMIT 1")
-                result = cursor.fetchone()
-                if result:
-                    # JSONB returns as dict, convert to dict if needed
-                    data = result[0]
-                    if isinstance(data, dict):
-                        return data
-                    return json.loads(data) if isinstance(data, str) else data
-                return None
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT data FROM war_status ORDER BY timestamp DESC LIMIT 1")
+                    result = cursor.fetchone()
+                    return result[0] if result else None
             finally:
                 conn.close()
         except Exception as e:
@@ -361,17 +639,12 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT data FROM statistics ORDER BY timestamp DESC LIMIT 1"
-                )
-                result = cursor.fetchone()
-                if result:
-                    data = result[0]
-                    if isinstance(data, dict):
-                        return data
-                    return json.loads(data) if isinstance(data, str) else data
-                return None
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT data FROM statistics ORDER BY timestamp DESC LIMIT 1"
+                    )
+                    result = cursor.fetchone()
+                    return result[0] if result else None
             finally:
                 conn.close()
         except Exception as e:
@@ -383,18 +656,13 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT data FROM planet_status WHERE planet_index = %s ORDER BY timestamp DESC LIMIT 1",
-                    (planet_index,),
-                )
-                result = cursor.fetchone()
-                if result:
-                    data = result[0]
-                    if isinstance(data, dict):
-                        return data
-                    return json.loads(data) if isinstance(data, str) else data
-                return None
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT data FROM planet_status WHERE planet_index = %s ORDER BY timestamp DESC LIMIT 1",
+                        (planet_index,),
+                    )
+                    result = cursor.fetchone()
+                    return result[0] if result else None
             finally:
                 conn.close()
         except Exception as e:
@@ -406,33 +674,20 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT data FROM campaigns WHERE status = %s ORDER BY timestamp DESC",
-                    ("active",),
-                )
-                results = cursor.fetchall()
-                campaigns = []
-                for row in results:
-                    data = row[0]
-                    if isinstance(data, dict):
-                        campaigns.append(data)
-                    else:
-                        campaigns.append(json.loads(data) if isinstance(data, str) else data)
-                
-                # Filter campaigns to include only those not yet expired
-                active_campaigns = []
-                now = datetime.now(timezone.utc)
-                for campaign in campaigns:
-                    expiration_time = campaign.get("expiresAt")
-                    if expiration_time:
-                        exp_dt = self._parse_expiration_time(expiration_time)
-                        if exp_dt is None or now < exp_dt:
-                            active_campaigns.append(campaign)
-                    else:
-                        active_campaigns.append(campaign)
-                
-                return active_campaigns
+                with conn.cursor() as cursor:
+                    # Expiry is re-checked at read time (status is set on save).
+                    # campaign_expires_at (see src.migrations) reads naive values
+                    # as UTC and returns NULL for missing or unparseable ones,
+                    # which count as active.
+                    cursor.execute(
+                        """SELECT data FROM campaigns
+                           WHERE status = %s
+                             AND COALESCE(campaign_expires_at(data->>'expiresAt') > now(), TRUE)
+                           ORDER BY timestamp DESC""",
+                        ("active",),
+                    )
+                    campaigns = [row[0] for row in cursor.fetchall()]
+                    return campaigns
             finally:
                 conn.close()
         except Exception as e:
@@ -444,20 +699,13 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT data FROM assignments ORDER BY timestamp DESC LIMIT %s",
-                    (limit,),
-                )
-                results = cursor.fetchall()
-                assignments = []
-                for row in results:
-                    data = row[0]
-                    if isinstance(data, dict):
-                        assignments.append(data)
-                    else:
-                        assignments.append(json.loads(data) if isinstance(data, str) else data)
-                return assignments
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT data FROM assignments ORDER BY timestamp DESC LIMIT %s",
+                        (limit,),
+                    )
+                    assignments = [row[0] for row in cursor.fetchall()]
+                    return assignments
             finally:
                 conn.close()
         except Exception as e:
@@ -473,16 +721,12 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """INSERT INTO assignments (assignment_id, data) 
-                       VALUES (%s, %s)
-                       ON CONFLICT (assignment_id) 
-                       DO UPDATE SET data = EXCLUDED.data, timestamp = CURRENT_TIMESTAMP""",
-                    (assignment_id, json.dumps(data)),
-                )
-                conn.commit()
-                return True
+                with conn.cursor() as cursor:
+                    self._execute_statement(
+                        conn, cursor, "save_assignment", (assignment_id, _Json(data))
+                    )
+                    conn.commit()
+                    return True
             finally:
                 conn.close()
         except Exception as e:
@@ -494,16 +738,12 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """INSERT INTO dispatches (dispatch_id, data) 
-                       VALUES (%s, %s)
-                       ON CONFLICT (dispatch_id) 
-                       DO UPDATE SET data = EXCLUDED.data, timestamp = CURRENT_TIMESTAMP""",
-                    (dispatch_id, json.dumps(data)),
-                )
-                conn.commit()
-                return True
+                with conn.cursor() as cursor:
+                    self._execute_statement(
+                        conn, cursor, "save_dispatch", (dispatch_id, _Json(data))
+                    )
+                    conn.commit()
+                    return True
             finally:
                 conn.close()
         except Exception as e:
@@ -515,24 +755,16 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT data FROM dispatches ORDER BY timestamp DESC"
-                )
-                results = cursor.fetchall()
-                # Parse and sort by published date from JSON data (newest first)
-                dispatches = []
-                for row in results:
-                    data = row[0]
-                    if isinstance(data, dict):
-                        dispatches.append(data)
-                    else:
-                        dispatches.append(json.loads(data) if isinstance(data, str) else data)
-                dispatches.sort(
-                    key=lambda x: x.get("published", ""),
-                    reverse=True
-                )
-                return dispatches[:limit]
+                with conn.cursor() as cursor:
+                    # Sorted and limited server-side via idx_dispatches_published
+                    cursor.execute(
+                        """SELECT data FROM dispatches
+                           ORDER BY (data->>'published') DESC NULLS LAST
+                           LIMIT %s""",
+                        (limit,),
+                    )
+                    dispatches = [row[0] for row in cursor.fetchall()]
+                    return dispatches
             finally:
                 conn.close()
         except Exception as e:
@@ -548,19 +780,25 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                for assignment in data:
-                    assignment_id = assignment.get("id")
-                    if assignment_id:
-                        cursor.execute(
-                            """INSERT INTO assignments (assignment_id, data) 
-                               VALUES (%s, %s)
-                               ON CONFLICT (assignment_id) 
+                with conn.cursor() as cursor:
+                    rows = {}
+                    for assignment in data:
+                        assignment_id = assignment.get("id")
+                        if assignment_id:
+                            rows[assignment_id] = (assignment_id, _Json(assignment))
+                    if rows:
+                        psycopg2.extras.execute_values(
+                            cursor,
+                            """INSERT INTO assignments (assignment_id, data)
+                               VALUES %s
+                               ON CONFLICT (assignment_id)
                                DO UPDATE SET data = EXCLUDED.data, timestamp = CURRENT_TIMESTAMP""",
-                            (assignment_id, json.dumps(assignment)),
+                            list(rows.values()),
+                            template="(%s, %s)",
+                            page_size=BATCH_PAGE_SIZE,
                         )
-                conn.commit()
-                return True
+                    conn.commit()
+                    return True
             finally:
                 conn.close()
         except Exception as e:
@@ -572,19 +810,25 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                for dispatch in data:
-                    dispatch_id = dispatch.get("id")
-                    if dispatch_id:
-                        cursor.execute(
-                            """INSERT INTO dispatches (dispatch_id, data) 
-                               VALUES (%s, %s)
-                               ON CONFLICT (dispatch_id) 
+                with conn.cursor() as cursor:
+                    rows = {}
+                    for dispatch in data:
+                        dispatch_id = dispatch.get("id")
+                        if dispatch_id:
+                            rows[dispatch_id] = (dispatch_id, _Json(dispatch))
+                    if rows:
+                        psycopg2.extras.execute_values(
+                            cursor,
+                            """INSERT INTO dispatches (dispatch_id, data)
+                               VALUES %s
+                               ON CONFLICT (dispatch_id)
                                DO UPDATE SET data = EXCLUDED.data, timestamp = CURRENT_TIMESTAMP""",
-                            (dispatch_id, json.dumps(dispatch)),
+                            list(rows.values()),
+                            template="(%s, %s)",
+                            page_size=BATCH_PAGE_SIZE,
                         )
-                conn.commit()
-                return True
+                    conn.commit()
+                    return True
             finally:
                 conn.close()
         except Exception as e:
@@ -596,19 +840,15 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """INSERT INTO planet_events (event_id, planet_index, event_type, data) 
-                       VALUES (%s, %s, %s, %s)
-                       ON CONFLICT (event_id) 
-                       DO UPDATE SET planet_index = EXCLUDED.planet_index, 
-                                     event_type = EXCLUDED.event_type, 
-                                     data = EXCLUDED.data, 
-                                     timestamp = CURRENT_TIMESTAMP""",
-                    (event_id, planet_index, event_type, json.dumps(data)),
-                )
-                conn.commit()
-                return True
+                with conn.cursor() as cursor:
+                    self._execute_statement(
+                        conn,
+                        cursor,
+                        "save_planet_event",
+                        (event_id, planet_index, event_type, _Json(data)),
+                    )
+                    conn.commit()
+                    return True
             finally:
                 conn.close()
         except Exception as e:
@@ -620,25 +860,31 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                for event in data:
-                    event_id = event.get("id")
-                    # Support both snake_case and camelCase for planet_index, explicit None checks
-                    planet_index = event.get("planet_index") if "planet_index" in event else event.get("planetIndex")
-                    event_type = event.get("event_type") if "event_type" in event else event.get("eventType", "unknown")
-                    if event_id and planet_index:
-                        cursor.execute(
-                            """INSERT INTO planet_events (event_id, planet_index, event_type, data) 
-                               VALUES (%s, %s, %s, %s)
-                               ON CONFLICT (event_id) 
-                               DO UPDATE SET planet_index = EXCLUDED.planet_index, 
-                                             event_type = EXCLUDED.event_type, 
-                                             data = EXCLUDED.data, 
+                with conn.cursor() as cursor:
+                    rows = {}
+                    for event in data:
+                        event_id = event.get("id")
+                        # Support both snake_case and camelCase keys; 0 is a valid id/index
+                        planet_index = event.get("planet_index", event.get("planetIndex"))
+                        event_type = event.get("event_type", event.get("eventType", "unknown"))
+                        if event_id is not None and planet_index is not None:
+                            rows[event_id] = (event_id, planet_index, event_type, _Json(event))
+                    if rows:
+                        psycopg2.extras.execute_values(
+                            cursor,
+                            """INSERT INTO planet_events (event_id, planet_index, event_type, data)
+                               VALUES %s
+                               ON CONFLICT (event_id)
+                               DO UPDATE SET planet_index = EXCLUDED.planet_index,
+                                             event_type = EXCLUDED.event_type,
+                                             data = EXCLUDED.data,
                                              timestamp = CURRENT_TIMESTAMP""",
-                            (event_id, planet_index, event_type, json.dumps(event)),
+                            list(rows.values()),
+                            template="(%s, %s, %s, %s)",
+                            page_size=BATCH_PAGE_SIZE,
                         )
-                conn.commit()
-                return True
+                    conn.commit()
+                    return True
             finally:
                 conn.close()
         except Exception as e:
@@ -652,26 +898,19 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                if planet_index:
-                    cursor.execute(
-                        "SELECT data FROM planet_events WHERE planet_index = %s ORDER BY timestamp DESC LIMIT %s",
-                        (planet_index, limit),
-                    )
-                else:
-                    cursor.execute(
-                        "SELECT data FROM planet_events ORDER BY timestamp DESC LIMIT %s",
-                        (limit,),
-                    )
-                results = cursor.fetchall()
-                events = []
-                for row in results:
-                    data = row[0]
-                    if isinstance(data, dict):
-                        events.append(data)
+                with conn.cursor() as cursor:
+                    if planet_index is not None:
+                        cursor.execute(
+                            "SELECT data FROM planet_events WHERE planet_index = %s ORDER BY timestamp DESC LIMIT %s",
+                            (planet_index, limit),
+                        )
                     else:
-                        events.append(json.loads(data) if isinstance(data, str) else data)
-                return events
+                        cursor.execute(
+                            "SELECT data FROM planet_events ORDER BY timestamp DESC LIMIT %s",
+                            (limit,),
+                        )
+                    events = [row[0] for row in cursor.fetchall()]
+                    return events
             finally:
                 conn.close()
         except Exception as e:
@@ -682,226 +921,174 @@ class Database:
         """Get latest planet events (alias for get_planet_events with no planet_index filter)"""
         return self.get_planet_events(limit=limit)
 
+    def _iter_history(self, query: str, params: tuple, limit: int) -> Iterator[Dict]:
+        """Yield {"data", "timestamp"} rows of a history query
+
+        Above HISTORY_STREAM_THRESHOLD rows a named (server-side) cursor is
+        used, so rows are fetched and decoded HISTORY_ITERSIZE at a time
+        instead of all at once. The pooled connection is held until the
+        generator is exhausted or closed.
+        """
+        conn = self._get_connection()
+        try:
+            streaming = limit > HISTORY_STREAM_THRESHOLD
+            if streaming:
+                cursor = conn.cursor(name="history")
+                cursor.itersize = HISTORY_ITERSIZE
+            else:
+                cursor = conn.cursor()
+            with cursor:
+                cursor.execute(query, params)
+                for data, timestamp in cursor if streaming else cursor.fetchall():
+                    yield {"data": data, "timestamp": timestamp}
+        finally:
+            conn.close()
+
+    def iter_planet_status_history(self, planet_index: int, limit: int = 10) -> Iterator[Dict]:
+        """Iterate status history for a planet, newest first (see _iter_history)"""
+        return self._iter_history(
+            "SELECT data, timestamp FROM planet_status WHERE planet_index = %s "
+            "ORDER BY timestamp DESC LIMIT %s",
+            (planet_index, limit),
+            limit,
+        )
+
     def get_planet_status_history(self, planet_index: int, limit: int = 10) -> List[Dict]:
         """Get status history for a planet"""
         try:
-            conn = self._get_connection()
-            try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT data, timestamp FROM planet_status WHERE planet_index = %s ORDER BY timestamp DESC LIMIT %s",
-                    (planet_index, limit),
-                )
-                results = cursor.fetchall()
-                history = []
-                for row in results:
-                    data = row[0]
-                    if isinstance(data, dict):
-                        history.append({"data": data, "timestamp": row[1]})
-                    else:
-                        history.append({"data": json.loads(data) if isinstance(data, str) else data, "timestamp": row[1]})
-                return history
-            finally:
-                conn.close()
+            return list(self.iter_planet_status_history(planet_index, limit))
         except Exception as e:
             logger.error(f"Failed to get planet status history: {e}")
             return []
 
+    def iter_statistics_history(self, limit: int = 100) -> Iterator[Dict]:
+        """Iterate statistics history, newest first (see _iter_history)"""
+        return self._iter_history(
+            "SELECT data, timestamp FROM statistics ORDER BY timestamp DESC LIMIT %s",
+            (limit,),
+            limit,
+        )
+
     def get_statistics_history(self, limit: int = 100) -> List[Dict]:
         """Get statistics history"""
         try:
-            conn = self._get_connection()
-            try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT data, timestamp FROM statistics ORDER BY timestamp DESC LIMIT %s",
-                    (limit,),
-                )
-                results = cursor.fetchall()
-                history = []
-                for row in results:
-                    data = row[0]
-                    if isinstance(data, dict):
-                        history.append({"data": data, "timestamp": row[1]})
-                    else:
-                        history.append({"data": json.loads(data) if isinstance(data, str) else data, "timestamp": row[1]})
-                return history
-            finally:
-                conn.close()
+            return list(self.iter_statistics_history(limit))
         except Exception as e:
             logger.error(f"Failed to get statistics history: {e}")
             return []
 
+    @_cached_snapshot
     def get_latest_planets_snapshot(self) -> Optional[List[Dict]]:
         """Get most recent cached snapshot of all planets
 
         Used as fallback when live API is unavailable.
-        Returns all planet status records from the most recent collection cycle.
+        Returns the latest status record of every planet.
         """
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                # Get the most recent timestamp from planet_status
-                cursor.execute(
-                    "SELECT DISTINCT timestamp FROM planet_status ORDER BY timestamp DESC LIMIT 1"
-                )
-                result = cursor.fetchone()
-
-                if not result:
-                    return None
-
-                latest_timestamp = result[0]
-
-                # Get all planets from that timestamp
-                cursor.execute(
-                    "SELECT data FROM planet_status WHERE timestamp = %s ORDER BY planet_index ASC",
-                    (latest_timestamp,),
-                )
-                results = cursor.fetchall()
-                planets = []
-                for row in results:
-                    data = row[0]
-                    if isinstance(data, dict):
-                        planets.append(data)
-                    else:
-                        planets.append(json.loads(data) if isinstance(data, str) else data)
-                return planets if planets else None
+                with conn.cursor() as cursor:
+                    self._limit_snapshot_read(cursor)
+                    # One row per planet at its newest timestamp. Rows from a cycle
+                    # are not stamped identically, so filtering on the single
+                    # newest timestamp would drop most planets.
+                    self._execute_statement(conn, cursor, "snapshot_planets", ())
+                    planets = [row[0] for row in cursor.fetchall()]
+                    return planets if planets else None
             finally:
                 conn.close()
         except Exception as e:
             logger.error(f"Failed to get latest planets snapshot: {e}")
             return None
 
-    def get_latest_campaigns_snapshot(self) -> Optional[List[Dict]]:
-        """Get most recent cached snapshot of all campaigns
+    @_cached_snapshot
+    def get_all_snapshots(self) -> Optional[Dict[str, Any]]:
+        """Get the campaigns, factions and biomes snapshots in one round trip
 
-        Used as fallback when live API is unavailable.
-        Returns most recent campaign data for each campaign.
+        Used as fallback when live API is unavailable. Returns a dict keyed
+        "campaigns" (the encoded JSON array), "factions" and "biomes", each
+        None when empty; None when all are empty or on error. The per-entity
+        snapshot methods read from it, so one cached query serves all three
+        fallback endpoints while the live API is down.
         """
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                # Get the most recent campaign data for each campaign_id
-                cursor.execute(
-                    """SELECT data FROM campaigns 
-                       WHERE (campaign_id, timestamp) IN (
-                           SELECT campaign_id, MAX(timestamp) FROM campaigns GROUP BY campaign_id
-                       )
-                       ORDER BY timestamp DESC"""
-                )
-                results = cursor.fetchall()
-                campaigns = []
-                for row in results:
-                    data = row[0]
-                    if isinstance(data, dict):
-                        campaigns.append(data)
-                    else:
-                        campaigns.append(json.loads(data) if isinstance(data, str) else data)
-                return campaigns if campaigns else None
+                with conn.cursor() as cursor:
+                    self._limit_snapshot_read(cursor)
+                    # Latest row per campaign_id (walks the campaign_id unique
+                    # index, no aggregate + join), aggregated newest first
+                    self._execute_statement(conn, cursor, "snapshot_all", ())
+                    row = cursor.fetchone()
+                    if not row or not any(row):
+                        return None
+                    campaigns, factions, biomes = row
+                    return {
+                        "campaigns": campaigns.encode() if campaigns is not None else None,
+                        "factions": factions,
+                        "biomes": biomes or None,
+                    }
             finally:
                 conn.close()
         except Exception as e:
-            logger.error(f"Failed to get latest campaigns snapshot: {e}")
+            logger.error(f"Failed to get snapshots: {e}")
             return None
 
+    def get_latest_campaigns_snapshot(self) -> Optional[List[Dict]]:
+        """Get most recent cached snapshot of all campaigns
+
+        Used as fallback when live API is unavailable.
+        Returns most recent campaign data for each campaign, decoded from
+        get_latest_campaigns_snapshot_raw.
+        """
+        raw = self.get_latest_campaigns_snapshot_raw()
+        return _loads(raw) if raw is not None else None
+
+    def get_latest_campaigns_snapshot_raw(self) -> Optional[bytes]:
+        """Get the campaigns snapshot as an encoded JSON array
+
+        Aggregated into JSON text server-side, so the bytes can be sent as a
+        response body without decoding and re-encoding every campaign.
+        """
+        snapshots = self.get_all_snapshots()
+        return snapshots["campaigns"] if snapshots else None
+
     def get_latest_factions_snapshot(self) -> Optional[List[Dict]]:
         """Get most recent cached snapshot of all factions
 
         Used as fallback when live API is unavailable.
         Factions are extracted from war status data.
         """
-        try:
-            conn = self._get_connection()
-            try:
-                cursor = conn.cursor()
-                cursor.execute("SELECT data FROM war_status ORDER BY timestamp DESC LIMIT 1")
-                result = cursor.fetchone()
-
-                if not result:
-                    return None
-
-                war_data = result[0]
-                if isinstance(war_data, dict):
-                    return war_data.get("factions", None)
-                else:
-                    war_dict = json.loads(war_data) if isinstance(war_data, str) else war_data
-                    return war_dict.get("factions", None)
-            finally:
-                conn.close()
-        except Exception as e:
-            logger.error(f"Failed to get latest factions snapshot: {e}")
-            return None
+        snapshots = self.get_all_snapshots()
+        return snapshots["factions"] if snapshots else None
 
     def get_latest_biomes_snapshot(self) -> Optional[List[Dict]]:
         """Get most recent cached snapshot of all biomes
 
         Used as fallback when live API is unavailable.
-        Biomes are extracted from planet data.
+        Biomes are maintained in the biomes table as planets are saved.
         """
-        try:
-            conn = self._get_connection()
-            try:
-                cursor = conn.cursor()
-                # Get the most recent timestamp from planet_status
-                cursor.execute(
-                    "SELECT DISTINCT timestamp FROM planet_status ORDER BY timestamp DESC LIMIT 1"
-                )
-                result = cursor.fetchone()
-
-                if not result:
-                    return None
-
-                latest_timestamp = result[0]
-
-                # Get all planets from that timestamp and extract unique biomes
-                cursor.execute(
-                    "SELECT data FROM planet_status WHERE timestamp = %s",
-                    (latest_timestamp,),
-                )
-                results = cursor.fetchall()
-
-                if not results:
-                    return None
-
-                # Extract unique biomes from planets
-                biomes = {}
-                for row in results:
-                    planet_data = row[0]
-                    if isinstance(planet_data, str):
-                        planet_data = json.loads(planet_data)
-                    elif not isinstance(planet_data, dict):
-                        continue
-                    
-                    # Type guard: check if biome is a dict before accessing .get()
-                    if "biome" in planet_data and isinstance(planet_data["biome"], dict):
-                        biome_name = planet_data["biome"].get("name")
-                        if biome_name and biome_name not in biomes:
-                            biomes[biome_name] = planet_data["biome"]
-
-                return list(biomes.values()) if biomes else None
-            finally:
-                conn.close()
-        except Exception as e:
-            logger.error(f"Failed to get latest biomes snapshot: {e}")
-            return None
+        snapshots = self.get_all_snapshots()
+        return snapshots["biomes"] if snapshots else None
 
     def update_system_status(self, key: str, value: str) -> bool:
-        """Update system status"""
+        """Update system status
+
+        Skips the write when this process already stored the same value, so
+        per-cycle calls with an unchanged status cost no round trip.
+        """
+        if self._system_status_written.get(key) == value:
+            return True
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """INSERT INTO system_status (key, value) 
-                       VALUES (%s, %s)
-                       ON CONFLICT (key) 
-                       DO UPDATE SET value = EXCLUDED.value, timestamp = CURRENT_TIMESTAMP""",
-                    (key, value),
-                )
-                conn.commit()
-                return True
+                with conn.cursor() as cursor:
+                    self._execute_statement(
+                        conn, cursor, "update_system_status", (key, value)
+                    )
+                    conn.commit()
+                    self._system_status_written[key] = value
+                    return True
             finally:
                 conn.close()
         except Exception as e:
@@ -913,10 +1100,10 @@ class Database:
         try:
             conn = self._get_connection()
             try:
-                cursor = conn.cursor()
-                cursor.execute("SELECT value FROM system_status WHERE key = %s", (key,))
-                result = cursor.fetchone()
-                return result[0] if result else None
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT value FROM system_status WHERE key = %s", (key,))
+                    result = cursor.fetchone()
+                    return result[0] if result else None
             finally:
                 conn.close()
         except Exception as e:
@@ -924,10 +1111,46 @@ class Database:
             return None
 
     def set_upstream_status(self, available: bool) -> bool:
-        """Set upstream API availability status"""
+        """Set upstream API availability status (cached locally, written through)"""
+        self._upstream_cache = (time.monotonic(), available)
         return self.update_system_status("upstream_api_available", "true" if available else "false")
 
     def get_upstream_status(self) -> bool:
-        """Get upstream API availability status"""
+        """Get upstream API availability status
+
+        Reads are reused for UPSTREAM_STATUS_TTL seconds, so frequent health
+        probes do not each query the database.
+        """
+        now = time.monotonic()
+        cached = self._upstream_cache
+        if cached is not None and now - cached[0] < UPSTREAM_STATUS_TTL:
+            return cached[1]
         status = self.get_system_status("upstream_api_available")
-        return status == "true" if status else False
+        available = status == "true" if status else False
+        self._upstream_cache = (now, available)
+        return available
+
+
+_db: Optional[Database] = None
+_db_lock = threading.Lock()
+
+
+def get_db(database_url: Optional[str] = None) -> Database:
+    """Get the process-wide Database, creating it on first call
+
+    Every entry point in a process shares this instance, and with it one
+    connection pool.
+
+    Args:
+        database_url: PostgreSQL connection string for the first call
+                     (DATABASE_URL env var if None). Later calls must pass
+                     the same URL or None.
+    """
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                _db = Database(database_url)
+    if database_url is not None and database_url != _db.database_url:
+        raise ValueError("get_db() already initialized with a different DATABASE_URL")
+    return _db
@@ -42,8 +42,9 @@ _collector = None
 def run_collector():
     """Run the data collector/poller"""
     import signal
-    import time
-    from src.database import Database
+    import threading
+    from src.database import get_db
+    from src.migrations import apply_schema
     from src.collector import DataCollector
     from src.config import Config
 
@@ -56,19 +57,20 @@ def run_collector():
     if not database_url:
         raise ValueError("DATABASE_URL environment variable must be set")
 
-    db = Database(database_url)
+    apply_schema(database_url)
+    db = get_db(database_url)
     logger.info("Database initialized with connection string")
 
     # Initialize collector
     interval = Config.SCRAPE_INTERVAL
     _collector = DataCollector(db, interval=interval)
 
+    shutdown = threading.Event()
+
     def signal_handler(sig, frame):
         """Handle shutdown signals"""
         logger.info("Received shutdown signal, stopping collector...")
-        if _collector:
-            _collector.stop()
-        sys.exit(0)
+        shutdown.set()
 
     # Register signal handlers
     signal.signal(signal.SIGINT, signal_handler)
@@ -79,9 +81,14 @@ def run_collector():
         _collector.start()
         logger.info(f"Collector started with {interval}s interval")
 
-        # Keep running
-        while _collector.is_running:
-            time.sleep(1)
+        # Keep running; block until a signal arrives instead of polling.
+        # signal.pause() does not exist on Windows, where a blocking wait is
+        # not interrupted by signals either, so it waits in 1s slices there.
+        while _collector.is_running and not shutdown.is_set():
+            if hasattr(signal, "pause"):
+                signal.pause()
+            else:
+                shutdown.wait(timeout=1.0)
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt received")
     except Exception as e:
@@ -0,0 +1,226 @@
+"""
+Database schema migrations
+
+The schema is applied once, explicitly, at process startup (API, collector
+and poller entry points) instead of lazily from the request path. Every
+statement is idempotent, so re-running it against an up-to-date database
+is a no-op.
+"""
+
+import logging
+from typing import List
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_STATEMENTS: List[str] = [
+    # War Status Table
+    """
+    CREATE TABLE IF NOT EXISTS war_status (
+        id SERIAL PRIMARY KEY,
+        data JSONB NOT NULL,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # Statistics Table
+    """
+    CREATE TABLE IF NOT EXISTS statistics (
+        id SERIAL PRIMARY KEY,
+        data JSONB NOT NULL,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # Planet Status Table
+    """
+    CREATE TABLE IF NOT EXISTS planet_status (
+        id SERIAL PRIMARY KEY,
+        planet_index INTEGER UNIQUE NOT NULL,
+        data JSONB NOT NULL,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # Biomes Table: one row per distinct planet biome, upserted by name on
+    # planet ingest so the biomes snapshot never scans planet JSON
+    """
+    CREATE TABLE IF NOT EXISTS biomes (
+        id SERIAL PRIMARY KEY,
+        name TEXT UNIQUE NOT NULL,
+        data JSONB NOT NULL,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "ALTER TABLE planet_status ADD COLUMN IF NOT EXISTS biome_id INTEGER REFERENCES biomes(id)",
+    # Campaigns Table
+    """
+    CREATE TABLE IF NOT EXISTS campaigns (
+        id SERIAL PRIMARY KEY,
+        campaign_id BIGINT UNIQUE NOT NULL,
+        planet_index INTEGER,
+        status TEXT,
+        data JSONB NOT NULL,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # Assignments Table (Major Orders)
+    """
+    CREATE TABLE IF NOT EXISTS assignments (
+        id SERIAL PRIMARY KEY,
+        assignment_id BIGINT UNIQUE NOT NULL,
+        data JSONB NOT NULL,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # Dispatches Table
+    """
+    CREATE TABLE IF NOT EXISTS dispatches (
+        id SERIAL PRIMARY KEY,
+        dispatch_id BIGINT UNIQUE NOT NULL,
+        data JSONB NOT NULL,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # Planet Events Table
+    """
+    CREATE TABLE IF NOT EXISTS planet_events (
+        id SERIAL PRIMARY KEY,
+        event_id BIGINT UNIQUE NOT NULL,
+        planet_index INTEGER,
+        event_type TEXT,
+        data JSONB NOT NULL,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # System Status Table
+    """
+    CREATE TABLE IF NOT EXISTS system_status (
+        id SERIAL PRIMARY KEY,
+        key TEXT UNIQUE NOT NULL,
+        value TEXT,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # data is always JSONB: the reads rely on psycopg2 decoding it and on
+    # jsonb operators/indexes. Convert columns left as TEXT/JSON by older
+    # deployments (no-op once converted).
+    """
+    DO $$
+    DECLARE
+        col record;
+    BEGIN
+        FOR col IN
+            SELECT table_name FROM information_schema.columns
+            WHERE table_schema = current_schema()
+              AND column_name = 'data'
+              AND data_type <> 'jsonb'
+              AND table_name IN ('war_status', 'statistics', 'planet_status', 'campaigns',
+                                 'assignments', 'dispatches', 'planet_events')
+        LOOP
+            EXECUTE format(
+                'ALTER TABLE %I ALTER COLUMN data TYPE jsonb USING data::jsonb',
+                col.table_name
+            );
+        END LOOP;
+    END
+    $$
+    """,
+    # Campaign expiresAt as a timestamptz for the active-campaign filter.
+    # Naive values are UTC (as the collector treats them); anything that
+    # does not parse is NULL instead of an error that would fail the query.
+    r"""
+    CREATE OR REPLACE FUNCTION campaign_expires_at(value text) RETURNS timestamptz
+    LANGUAGE plpgsql STABLE STRICT AS $$
+    BEGIN
+        IF value ~* '[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?\s*(Z|[+-]\d{2}(:?\d{2})?)$' THEN
+            RETURN value::timestamptz;
+        END IF;
+        RETURN value::timestamp AT TIME ZONE 'UTC';
+    EXCEPTION WHEN others THEN
+        RETURN NULL;
+    END
+    $$
+    """,
+    # Backfill biomes from planets stored before the biomes table existed
+    # (no-op once every planet with a biome has its biome_id)
+    """
+    INSERT INTO biomes (name, data)
+    SELECT DISTINCT ON (data->'biome'->>'name') data->'biome'->>'name', data->'biome'
+    FROM planet_status
+    WHERE biome_id IS NULL
+      AND jsonb_typeof(data->'biome') = 'object'
+      AND data->'biome'->>'name' <> ''
+    ORDER BY data->'biome'->>'name', timestamp DESC
+    ON CONFLICT (name) DO NOTHING
+    """,
+    """
+    UPDATE planet_status SET biome_id = biomes.id
+    FROM biomes
+    WHERE planet_status.biome_id IS NULL
+      AND planet_status.data->'biome'->>'name' = biomes.name
+    """,
+    # Indexes for frequently queried columns
+    "CREATE INDEX IF NOT EXISTS idx_war_status_timestamp ON war_status(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_statistics_timestamp ON statistics(timestamp)",
+    # Ordered per planet for the latest-first lookups. data is not
+    # INCLUDEd: planet JSON can exceed the btree tuple size limit.
+    # Replaces the plain planet_index index.
+    "DROP INDEX IF EXISTS idx_planet_status_index",
+    """CREATE INDEX IF NOT EXISTS idx_planet_status_index_ts
+       ON planet_status (planet_index, timestamp DESC)""",
+    "CREATE INDEX IF NOT EXISTS idx_campaigns_timestamp ON campaigns(timestamp)",
+    """CREATE INDEX IF NOT EXISTS idx_campaigns_active
+       ON campaigns (timestamp DESC) WHERE status = 'active'""",
+    "CREATE INDEX IF NOT EXISTS idx_assignments_timestamp ON assignments(timestamp)",
+    # Dispatches are read in published order (idx_dispatches_published);
+    # nothing filters or sorts them by timestamp
+    "DROP INDEX IF EXISTS idx_dispatches_timestamp",
+    """CREATE INDEX IF NOT EXISTS idx_dispatches_published
+       ON dispatches ((data->>'published') DESC NULLS LAST)""",
+    # Serves WHERE planet_index = ? ORDER BY timestamp DESC LIMIT ? as a
+    # bounded range scan with no sort. Replaces the plain planet_index index.
+    "DROP INDEX IF EXISTS idx_planet_events_index",
+    """CREATE INDEX IF NOT EXISTS idx_planet_events_index_ts
+       ON planet_events (planet_index, timestamp DESC)""",
+] + [
+    # GIN indexes for JSONB containment (data @> ...) lookups;
+    # jsonb_path_ops is smaller than the default opclass and covers @>
+    f"CREATE INDEX IF NOT EXISTS idx_{table}_data_gin ON {table} USING GIN (data jsonb_path_ops)"
+    for table in ("campaigns", "planet_status", "planet_events")
+] + [
+    # BRIN indexes for timestamp range scans on the append-only history
+    # tables, where physical order follows insert time (a few pages vs. a
+    # full btree). Upserted tables rewrite timestamp in place, so they keep
+    # only their btree indexes.
+    f"CREATE INDEX IF NOT EXISTS brin_{table}_timestamp "
+    f"ON {table} USING BRIN (timestamp) WITH (pages_per_range = 32)"
+    for table in ("war_status", "statistics")
+] + [
+    # Tables upserted every collection cycle: leave page headroom for the new
+    # row versions and vacuum/analyze after 2% churn instead of the default 20%
+    f"""ALTER TABLE {table} SET (
+        fillfactor = 80,
+        autovacuum_vacuum_scale_factor = 0.02,
+        autovacuum_analyze_scale_factor = 0.02
+    )"""
+    for table in ("planet_status", "campaigns", "assignments", "dispatches")
+]
+
+
+def apply_schema(dsn: str) -> None:
+    """Create or upgrade the database schema in a single transaction
+
+    Errors propagate: a process that cannot apply its schema should fail at
+    startup rather than on its first query.
+
+    Args:
+        dsn: PostgreSQL connection string
+    """
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn:
+            with conn.cursor() as cursor:
+                for statement in SCHEMA_STATEMENTS:
+                    cursor.execute(statement)
+    finally:
+        conn.close()
+    logger.info("Database schema applied (%d statements)", len(SCHEMA_STATEMENTS))
@@ -9,7 +9,8 @@ Runs as a standalone process, separate from the API service.
 import logging
 import signal
 import sys
-from src.database import Database
+from src.database import get_db
+from src.migrations import apply_schema
 from src.collector import DataCollector
 from src.config import Config
 
@@ -39,15 +40,13 @@ def main():
     logger.info("Starting High Command API Poller Service")
     
     # Initialize database
-    db_path = Config.DATABASE_URL.replace("sqlite:///", "")
-    if db_path.startswith("/"):
-        db_path = db_path
-    else:
-        # Default to data directory in container
-        db_path = f"/data/{db_path}"
-    
-    db = Database(db_path)
-    logger.info(f"Database initialized at: {db_path}")
+    database_url = Config.DATABASE_URL
+    if not database_url:
+        raise ValueError("DATABASE_URL environment variable must be set")
+
+    apply_schema(database_url)
+    db = get_db(database_url)
+    logger.info("Database initialized with connection string")
     
     # Initialize collector
     interval = Config.SCRAPE_INTERVAL
@@ -72,6 +71,7 @@ def main():
     finally:
         if collector:
             collector.stop()
+        db.close_pool()
         logger.info("Poller service stopped")
 
 
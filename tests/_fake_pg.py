@@ -0,0 +1,91 @@
+"""
+Hand-rolled stand-ins for a psycopg2 connection and cursor.
+
+Plain classes with __slots__: one attribute write per call instead of
+MagicMock's call recording and child-mock creation. Use them for tests that
+only stage query results and check what was executed; tests that need
+call_args_list or assert_called_* keep the mock_psycopg2 fixture.
+"""
+
+from typing import Any, List, Optional, Tuple
+
+
+class FakeCursor:
+    """Cursor that records executed SQL and returns staged rows"""
+
+    __slots__ = ("execute_calls", "last_sql", "last_params", "itersize", "_fetchone", "_fetchall")
+
+    def __init__(self):
+        self.execute_calls = 0
+        self.last_sql: Optional[str] = None
+        self.last_params: Any = None
+        self.itersize = 2000
+        self._fetchone: Any = None
+        self._fetchall: List[Any] = []
+
+    def set_fetchone(self, row: Any) -> None:
+        """Row returned by fetchone()"""
+        self._fetchone = row
+
+    def set_fetchall(self, rows: List[Any]) -> None:
+        """Rows returned by fetchall() and by iterating the cursor"""
+        self._fetchall = rows
+
+    def execute(self, sql: str, params: Any = None) -> None:
+        self.execute_calls += 1
+        self.last_sql = sql
+        self.last_params = params
+
+    def copy_expert(self, sql: str, file: Any) -> None:
+        self.execute(sql)
+
+    def fetchone(self) -> Any:
+        return self._fetchone
+
+    def fetchall(self) -> List[Any]:
+        return self._fetchall
+
+    def __iter__(self):
+        return iter(self._fetchall)
+
+    def __enter__(self) -> "FakeCursor":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+class FakeConn:
+    """Connection handing out one shared FakeCursor"""
+
+    __slots__ = ("cursor_obj", "cursor_names", "commits", "rollbacks", "closes")
+
+    def __init__(self, cursor: FakeCursor):
+        self.cursor_obj = cursor
+        self.cursor_names: List[Optional[str]] = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.closes = 0
+
+    @property
+    def raw(self) -> "FakeConn":
+        return self
+
+    def cursor(self, name: Optional[str] = None) -> FakeCursor:
+        self.cursor_names.append(name)
+        return self.cursor_obj
+
+    def commit(self) -> None:
+        self.commits += 1
+
+    def rollback(self) -> None:
+        self.rollbacks += 1
+
+    def close(self) -> None:
+        self.closes += 1
+
+
+def make_fake_psycopg2() -> Tuple[FakeConn, FakeCursor]:
+    """Create a fake connection and the cursor it returns"""
+    cursor = FakeCursor()
+    return FakeConn(cursor), cursor
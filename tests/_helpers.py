@@ -0,0 +1,8 @@
+"""
+Assertion helpers shared by the database tests.
+"""
+
+
+def assert_saved(cursor, conn):
+    """Assert a write ran at least one statement and was committed"""
+    assert cursor.execute.called and conn.commit.called
@@ -91,11 +91,11 @@ class TestCampaignEndpoints:
         assert isinstance(data, list)
 
     @patch("src.app.scraper.get_campaign_info")
-    @patch("src.app.db.get_latest_campaigns_snapshot")
+    @patch("src.app.db.get_latest_campaigns_snapshot_raw")
     def test_get_campaigns_cache_fallback(self, mock_cache, mock_scraper, client):
         """Test campaigns cache fallback when API fails"""
         mock_scraper.return_value = None
-        mock_cache.return_value = [{"id": 1, "cached": True}]
+        mock_cache.return_value = b'[{"id": 1, "cached": true}]'
 
         response = client.get("/api/campaigns")
         assert response.status_code == 200
@@ -103,7 +103,7 @@ class TestCampaignEndpoints:
         assert data[0]["cached"] is True
 
     @patch("src.app.scraper.get_campaign_info")
-    @patch("src.app.db.get_latest_campaigns_snapshot")
+    @patch("src.app.db.get_latest_campaigns_snapshot_raw")
     def test_get_campaigns_both_fail(self, mock_cache, mock_scraper, client):
         """Test campaigns when both API and cache fail"""
         mock_scraper.return_value = None
@@ -23,6 +23,23 @@ class TestLivezEndpoint:
         assert data == {"status": "ok"}
 
 
+class TestConfigEndpoint:
+    """Test public UI config endpoint."""
+
+    def test_config_reports_claude_enabled(self, client):
+        """Config mirrors whether a Claude key was configured at startup."""
+        with patch.dict("src.app_readonly.PUBLIC_CONFIG", {"claudeEnabled": True}):
+            response = client.get("/api/config")
+        assert response.status_code == 200
+        assert response.json() == {"claudeEnabled": True}
+
+    def test_responses_are_serialized_with_orjson(self, client):
+        """Handlers returning plain dicts are rendered by ORJSONResponse."""
+        with patch.dict("src.app_readonly.PUBLIC_CONFIG", {"claudeEnabled": False}):
+            response = client.get("/api/config")
+        assert response.content == b'{"claudeEnabled":false}'
+
+
 class TestHealthEndpoint:
     """Test health endpoint (includes DB check)."""
 
@@ -0,0 +1,282 @@
+"""Unit tests for the Claude API proxy router."""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src import claude_proxy
+
+
+class _ByteStream(httpx.AsyncByteStream):
+    """Unread upstream body, as a real transport would return it"""
+
+    def __init__(self, data: bytes):
+        self._data = data
+
+    async def __aiter__(self):
+        yield self._data
+
+
+@pytest.fixture
+def mock_upstream():
+    """Factory installing a mock upstream transport on the shared proxy client
+
+    Call it with a request handler; it returns the list of requests the
+    handler has seen. The client is closed and cleared on teardown.
+    """
+    calls = []
+
+    def install(handler):
+        def record(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return handler(request)
+
+        claude_proxy._client = httpx.AsyncClient(
+            base_url=claude_proxy.ANTHROPIC_BASE, transport=httpx.MockTransport(record)
+        )
+        return calls
+
+    yield install
+    asyncio.run(claude_proxy.close_client())
+
+
+@pytest.fixture
+def upstream(mock_upstream):
+    """Install a mock upstream that answers every request with a small JSON body"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={"content-type": "application/json", "x-request-id": "req_1"},
+            stream=_ByteStream(b'{"id":"msg_1"}'),
+        )
+
+    return mock_upstream(handler)
+
+
+@pytest.fixture
+def api_key(monkeypatch):
+    """Configure a server-side Claude API key"""
+    monkeypatch.setattr(claude_proxy, "_API_KEY", "sk-test")
+    monkeypatch.setattr(
+        claude_proxy,
+        "_STATIC_REQUEST_HEADERS",
+        [(b"x-api-key", b"sk-test"), (b"anthropic-dangerous-direct-browser-access", b"true")],
+    )
+    return "sk-test"
+
+
+@pytest.fixture
+def client():
+    """Create test client with only the Claude router mounted"""
+    app = FastAPI()
+    app.include_router(claude_proxy.router)
+    return TestClient(app)
+
+
+class TestClaudeProxy:
+    """Test request forwarding to Anthropic"""
+
+    def test_missing_api_key_returns_503(self, client, upstream, monkeypatch):
+        """Proxy refuses requests when no server key is configured"""
+        monkeypatch.setattr(claude_proxy, "_API_KEY", "")
+        response = client.post("/claude/messages", json={})
+        assert response.status_code == 503
+        assert response.json()["detail"].startswith("Claude API key not configured")
+        assert upstream == []
+
+    def test_forwards_request_with_server_key(self, client, upstream, api_key):
+        """Request is forwarded to /v1/<path> with the server API key"""
+        response = client.post(
+            "/claude/messages",
+            content=b'{"model":"claude"}',
+            headers={"x-api-key": "client-key", "content-type": "application/json"},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"id": "msg_1"}
+        assert response.headers["x-request-id"] == "req_1"
+
+        sent = upstream[0]
+        assert sent.method == "POST"
+        assert sent.url == "https://api.anthropic.com/v1/messages"
+        assert sent.headers.get_list("x-api-key") == ["sk-test"]
+        assert sent.headers["host"] == "api.anthropic.com"
+        assert sent.content == b'{"model":"claude"}'
+
+    def test_reuses_shared_client(self, client, upstream, api_key):
+        """All requests go through the same pooled client"""
+        shared = claude_proxy._get_client()
+        client.post("/claude/messages", json={})
+        client.post("/claude/messages", json={})
+        assert claude_proxy._get_client() is shared
+        assert len(upstream) == 2
+
+    def test_shared_client_uses_http2(self, monkeypatch):
+        """Lazily created upstream client is built with HTTP/2 enabled"""
+        real_client = httpx.AsyncClient
+        created = []
+
+        def client_factory(**kwargs):
+            created.append(kwargs)
+            return real_client(**kwargs)
+
+        monkeypatch.setattr(claude_proxy.httpx, "AsyncClient", client_factory)
+        claude_proxy._client = None
+        shared = claude_proxy._get_client()
+        try:
+            assert claude_proxy._get_client() is shared
+            assert len(created) == 1
+            assert created[0]["http2"] is True
+        finally:
+            asyncio.run(claude_proxy.close_client())
+        assert claude_proxy._client is None
+
+    @pytest.mark.parametrize(
+        "error", [httpx.ConnectError, httpx.ReadTimeout, httpx.RemoteProtocolError]
+    )
+    def test_upstream_error_returns_502(self, client, api_key, mock_upstream, error):
+        """Transport failures surface as 502"""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise error("upstream failed", request=request)
+
+        mock_upstream(handler)
+        response = client.post("/claude/messages", json={})
+        assert response.status_code == 502
+        assert response.json() == {"detail": "Upstream error: upstream failed"}
+
+    def test_streams_raw_encoded_body(self, client, api_key, mock_upstream):
+        """Upstream bytes are relayed untouched, keeping content-encoding"""
+        import gzip
+
+        payload = gzip.compress(b'{"id":"msg_1"}')
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200, headers={"content-encoding": "gzip"}, stream=_ByteStream(payload)
+            )
+
+        mock_upstream(handler)
+        response = client.get("/claude/models")
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == {"id": "msg_1"}
+
+    def test_strips_hop_by_hop_headers(self, client, upstream, api_key):
+        """Hop-by-hop request headers are not forwarded upstream"""
+        client.post(
+            "/claude/messages",
+            json={},
+            headers={"te": "trailers", "proxy-authorization": "Basic abc", "x-custom": "1"},
+        )
+        sent = upstream[0]
+        assert "te" not in sent.headers
+        assert "proxy-authorization" not in sent.headers
+        assert sent.headers["x-custom"] == "1"
+
+    def test_routes_each_method(self, client, upstream, api_key):
+        """Every proxied method reaches upstream with its own method"""
+        for method in ("GET", "POST", "PUT", "PATCH", "DELETE"):
+            response = client.request(method, "/claude/models")
+            assert response.status_code == 200
+        assert [r.method for r in upstream] == ["GET", "POST", "PUT", "PATCH", "DELETE"]
+
+    def test_nested_path_maps_under_v1(self, client, upstream, api_key):
+        """Nested proxy paths are joined onto the /v1 base URL"""
+        client.post("/claude/messages/count_tokens", json={})
+        assert upstream[0].url == "https://api.anthropic.com/v1/messages/count_tokens"
+
+    def test_strips_mixed_case_hop_by_hop_response_headers(self, client, api_key, mock_upstream):
+        """Upstream hop-by-hop headers are dropped regardless of case"""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200,
+                headers=[
+                    (b"Connection", b"keep-alive"),
+                    (b"Keep-Alive", b"timeout=5"),
+                    (b"Content-Type", b"application/json"),
+                    (b"X-Request-Id", b"req_1"),
+                ],
+                stream=_ByteStream(b"{}"),
+            )
+
+        mock_upstream(handler)
+        response = client.get("/claude/models")
+        assert "keep-alive" not in response.headers
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["x-request-id"] == "req_1"
+
+    @pytest.mark.parametrize(
+        "path", ["/claude/https://evil.example/steal", "/claude/https:%2F%2Fevil.example/steal"]
+    )
+    def test_absolute_url_path_stays_on_anthropic(self, client, upstream, api_key, path):
+        """A path that is itself a URL cannot redirect the request (and key) elsewhere"""
+        client.get(path)
+        sent = upstream[0]
+        assert sent.url.host == "api.anthropic.com"
+        assert sent.url.path.startswith("/v1/")
+
+    def test_empty_path_maps_to_v1_root(self, client, upstream, api_key):
+        """Bare /claude/ is forwarded to the /v1/ root"""
+        client.get("/claude/")
+        assert upstream[0].url == "https://api.anthropic.com/v1/"
+
+    def test_bodyless_request_sends_no_content(self, client, upstream, api_key):
+        """Requests without a body are forwarded without one"""
+        client.get("/claude/models")
+        sent = upstream[0]
+        assert sent.content == b""
+        assert "content-length" not in sent.headers
+        assert "transfer-encoding" not in sent.headers
+
+    def test_streams_server_sent_events(self, client, api_key, mock_upstream):
+        """SSE replies are relayed chunk by chunk with proxy buffering disabled"""
+
+        class _EventStream(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                yield b"event: message_start\ndata: {}\n\n"
+                yield b"event: message_stop\ndata: {}\n\n"
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200, headers={"content-type": "text/event-stream"}, stream=_EventStream()
+            )
+
+        mock_upstream(handler)
+        with client.stream("POST", "/claude/messages", json={"stream": True}) as response:
+            chunks = list(response.iter_raw())
+        assert response.headers["content-type"] == "text/event-stream"
+        assert response.headers["x-accel-buffering"] == "no"
+        assert b"".join(chunks).count(b"event: ") == 2
+
+    def test_messages_route_matched_before_catch_all(self, client, upstream, api_key):
+        """POST /claude/messages hits the literal route first"""
+        paths = [route.path for route in claude_proxy.router.routes]
+        assert paths.index("/claude/messages") < paths.index("/claude/{path:path}")
+        client.post("/claude/messages", json={})
+        assert upstream[0].url == "https://api.anthropic.com/v1/messages"
+
+    def test_closes_upstream_on_mid_stream_error(self, client, api_key, mock_upstream):
+        """Upstream connection is released when the body fails part-way"""
+        closed = []
+
+        class _BrokenStream(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                yield b"event: message_start\n\n"
+                raise httpx.ReadError("connection reset")
+
+            async def aclose(self):
+                closed.append(True)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(
+                200, headers={"content-type": "text/event-stream"}, stream=_BrokenStream()
+            )
+
+        mock_upstream(handler)
+        with pytest.raises(httpx.ReadError):
+            client.post("/claude/messages", json={"stream": True})
+        assert closed
@@ -125,8 +125,30 @@ class TestDataCollection:
         collector = DataCollector(mock_db, interval=300)
         collector.collect_all_data()
 
-        # Verify campaign was saved
-        mock_db.save_campaign.assert_called()
+        # Verify campaigns were saved in the cycle's transaction
+        cursor = mock_db.transaction.return_value.__enter__.return_value
+        mock_db.save_campaigns_tx.assert_called_once_with(cursor, mock_campaigns.return_value)
+
+    @patch.object(HellDivers2Scraper, "get_planets")
+    @patch.object(HellDivers2Scraper, "get_campaign_info")
+    def test_planets_and_campaigns_share_one_transaction(
+        self, mock_campaigns, mock_planets, mock_db
+    ):
+        """Test planet and campaign saves are committed together"""
+        mock_planets.return_value = [{"index": 0}, {"index": 1}]
+        mock_campaigns.return_value = [{"id": 1, "planet": {"index": 1}}]
+
+        collector = DataCollector(mock_db, interval=300)
+        collector.collect_all_data()
+
+        mock_db.transaction.assert_called_once_with(synchronous_commit=False)
+        cursor = mock_db.transaction.return_value.__enter__.return_value
+        mock_db.save_planet_statuses_tx.assert_called_once_with(cursor, mock_planets.return_value)
+        mock_db.save_campaigns_tx.assert_called_once_with(cursor, mock_campaigns.return_value)
+        # The whole cycle runs on one pinned connection
+        mock_db.pinned_connection.assert_called_once_with()
+        mock_db.pinned_connection.return_value.__exit__.assert_called_once()
+        mock_db.invalidate_snapshots.assert_called_once_with()
 
     @patch.object(HellDivers2Scraper, "get_assignments")
     def test_collect_assignments(self, mock_assignments, mock_db):
@@ -176,7 +198,7 @@ class TestErrorHandling:
     def test_collection_with_database_error(self, mock_planets, mock_db):
         """Test collection handles database errors"""
         mock_planets.return_value = [{"index": 1}]
-        mock_db.save_planet_status.side_effect = Exception("DB Error")
+        mock_db.save_planet_statuses_tx.side_effect = Exception("DB Error")
 
         collector = DataCollector(mock_db, interval=300)
         # Should handle error and continue
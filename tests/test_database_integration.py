@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Integration tests for the database module against a real PostgreSQL.
+
+Run with `pytest -m integration` (Docker required). These exercise the SQL
+itself - schema, upserts, COPY staging, JSONB aggregation - which the
+mocked unit tests in test_database.py cannot.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("pytest_pg")
+
+pytestmark = pytest.mark.integration
+
+
+class TestRoundTrips:
+    """Test that saved data reads back unchanged"""
+
+    def test_war_status(self, real_db):
+        """Test a war status document round trip"""
+        data = {"war_id": 1, "factions": [{"id": 1, "name": "Terminids"}]}
+        assert real_db.save_war_status(data) is True
+        assert real_db.get_latest_war_status() == data
+        assert real_db.get_latest_factions_snapshot() == data["factions"]
+
+    def test_planet_statuses_and_biomes(self, real_db):
+        """Test the COPY upsert and the biomes table it maintains"""
+        planets = [
+            {"index": 0, "name": "Super Earth", "biome": {"name": "Earth"}},
+            {"index": 1, "name": "C:\\Test\tTab", "biome": {"name": "Desert"}},
+            {"index": 2, "name": "No Biome"},
+        ]
+        assert real_db.save_planet_statuses(planets) is True
+        assert real_db.save_planet_statuses(planets[:1]) is True
+
+        assert real_db.get_planet_status(1) == planets[1]
+        assert real_db.get_latest_biomes_snapshot() == [{"name": "Desert"}, {"name": "Earth"}]
+
+    def test_campaigns_raw_snapshot(self, real_db):
+        """Test the server-built campaigns JSON matches the decoded snapshot"""
+        campaigns = [{"id": 1, "planet": {"index": 5}}, {"id": 2, "planet": {"index": 6}}]
+        assert real_db.save_campaigns(campaigns) is True
+
+        snapshot = sorted(real_db.get_latest_campaigns_snapshot(), key=lambda c: c["id"])
+        raw = json.loads(real_db.get_latest_campaigns_snapshot_raw())
+        assert [c["id"] for c in snapshot] == [1, 2]
+        assert sorted(raw, key=lambda c: c["id"]) == snapshot
+
+    def test_all_snapshots(self, real_db):
+        """Test the combined snapshot query against the real schema"""
+        assert real_db.get_all_snapshots() is None
+
+        war = {"war_id": 1, "factions": [{"id": 1}]}
+        assert real_db.save_war_status(war) is True
+        assert real_db.save_planet_statuses([{"index": 1, "biome": {"name": "Ice"}}]) is True
+        assert real_db.save_campaigns([{"id": 1, "planet": {"index": 1}}]) is True
+
+        snapshots = real_db.get_all_snapshots()
+        assert json.loads(snapshots["campaigns"]) == [{"id": 1, "planet": {"index": 1}}]
+        assert snapshots["factions"] == war["factions"]
+        assert snapshots["biomes"] == [{"name": "Ice"}]
+
+    def test_system_status(self, real_db):
+        """Test system_status upserts by key"""
+        assert real_db.update_system_status("k", "v1") is True
+        assert real_db.update_system_status("k", "v2") is True
+        assert real_db.get_system_status("k") == "v2"
+
+
+class TestActiveCampaigns:
+    """Test the expiresAt filter of get_active_campaigns"""
+
+    def test_invalid_date_counts_as_active(self, real_db):
+        """A timestamp-shaped but impossible date does not fail the query"""
+        campaigns = [
+            {"id": 1, "planet": {"index": 1}, "expiresAt": "2025-02-30T10:00"},
+            {"id": 2, "planet": {"index": 2}, "expiresAt": "2000-01-01T00:00:00Z"},
+        ]
+        assert real_db.save_campaigns(campaigns) is True
+        assert [c["id"] for c in real_db.get_active_campaigns()] == [1]
+
+    def test_naive_expiry_is_utc(self, real_db):
+        """Naive expiresAt is read as UTC whatever the session TimeZone"""
+        soon = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1)
+        campaign = {"id": 1, "planet": {"index": 1}, "expiresAt": soon.isoformat()}
+        with real_db.pinned_connection():
+            # UTC+14: read in session time, the expiry would be 13 hours ago
+            with real_db.transaction() as cursor:
+                cursor.execute("SET TIME ZONE 'Pacific/Kiritimati'")
+            assert real_db.save_campaigns([campaign]) is True
+            assert real_db.get_active_campaigns() == [campaign]